@@ -1,15 +1,29 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
 import warnings
 import os
-import re
+from functools import partial
+from data_files import resolve_csv_paths, files_fingerprint
+from figure_cache import FigureCache
+from landing_kpis import LANDING_KPIS_PATH, compute_landing_kpis, read_landing_kpis, write_landing_kpis
 warnings.filterwarnings('ignore')
 
+# plotly.express 등 무거운 모듈은 해당 차트를 그릴 때 import 한다
+# pandas와 분석 모듈(board_survival, district_join, savings, sharded_agg, snapshot)도
+# 사이드카 KPI 표시 전에 로드되지 않도록 사용하는 함수 안에서 import 한다
+
+# figure 캐시 메모리 예산 (직렬화된 JSON 기준)
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# 콜드 스타트 모드: 사전 계산된 KPI 사이드카로 데이터 로드 전에 KPI 행을 먼저 표시
+COLD_START = os.environ.get('DASHBOARD_COLD_START', '1') != '0'
+
+# 이 행 수(참여+찜) 이상이면 사용자/상품 집계를 여러 프로세스로 나눠 실행
+# 기본값은 측정한 손익분기점이 아니라 추정치다: 1코어 환경의 bench_sharded_agg.py 측정값
+# (spawn 워커 시작 ~0.5초, 병렬 구간 ~150ns/행)에 4코어 선형 확장을 가정해 외삽한 ~480만 행이며,
+# 다코어에서의 실제 확장 비율은 재 보지 않았다
+# 배포 환경에서는 --sizes 모드로 손익분기점을 직접 재서 환경 변수로 조정한다
+SHARDED_AGG_MIN_ROWS = int(os.environ.get('SHARDED_AGG_MIN_ROWS', 5_000_000))
+
 # 페이지 설정
 st.set_page_config(
     page_title="공동구매 플랫폼 운영자 대시보드",
@@ -68,36 +82,108 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 @st.cache_data
-def load_data():
-  """데이터 로드"""
-  data = {}
+def load_data(fingerprint):
+  """데이터 로드 (fingerprint가 바뀌면 다시 읽음)"""
+  import pandas as pd
 
-  csv_files = {
-      'products': 'products_dummy_860.csv',
-      'categories': 'categories_dummy_211.csv',
-      'users': 'users_dummy_200.csv',
-      'favorite': 'favorite_products_dummy_3000_updated.csv',
-      'participants': 'participants_dummy_2312.csv',
-      'group_products': 'group_products_dummy_366.csv',
-      'group_boards': 'group_boards_dummy_366_title_change.csv'
-  }
+  data = {}
 
-  for key, filename in csv_files.items():
-    for base_path in ['', 'data/']:
-      filepath = base_path + filename
-      try:
-        if os.path.exists(filepath):
-          data[key] = pd.read_csv(filepath)
-          break
-      except:
-        continue
-    else:
-      data[key] = pd.DataFrame()
+  for key, filepath in resolve_csv_paths().items():
+    data[key] = pd.DataFrame()
+    if filepath is None:
+      continue
+    try:
+      data[key] = pd.read_csv(filepath)
+    except:
+      continue
 
   return data
 
+@st.cache_data
+def load_snapshot_hash(fingerprint):
+  """로드된 데이터의 스냅샷 해시"""
+  from snapshot import compute_snapshot_hash
+
+  return compute_snapshot_hash(load_data(fingerprint))
+
+@st.cache_resource
+def get_figure_cache():
+  """세션 간 공유되는 figure 캐시"""
+  return FigureCache(max_bytes=FIGURE_CACHE_MAX_BYTES)
+
+def cached_figure(snapshot, chart_id, build, key_params=None, **params):
+  """스냅샷·차트 ID·뷰 파라미터(+ key_params)가 같으면 캐시된 figure 재사용"""
+  return get_figure_cache().get_or_build(snapshot, chart_id, build, key_params=key_params, **params)
+
+@st.cache_data
+def load_board_survival(snapshot, _data):
+  """공구방 모집 완료 현황과 마감 대비 생존 곡선 (스냅샷당 한 번 계산)
+
+  스냅샷의 가장 늦은 시각을 관측 시각으로 써서 마감 전 미모집 공구방은 그 시각에서 중도 절단한다.
+  """
+  from board_survival import BoardJoins, fill_survival, observed_at
+
+  as_of = observed_at(_data['group_boards'], _data['participants'])
+  joins = BoardJoins(_data['group_boards'], _data['participants'])
+  return joins.board_table(as_of=as_of), fill_survival(joins, scale='deadline', as_of=as_of)
+
+@st.cache_data
+def load_user_aggregates(snapshot, _data):
+  """사용자/상품 단위 집계 (스냅샷당 한 번 계산, 대용량이면 user_id 샤드 병렬 실행)"""
+  import pandas as pd
+  from sharded_agg import aggregate_by_user
+
+  participants = _data.get('participants', pd.DataFrame())
+  favorites = _data.get('favorite', pd.DataFrame())
+  n_workers = None if len(participants) + len(favorites) >= SHARDED_AGG_MIN_ROWS else 1
+
+  aggregates = aggregate_by_user(participants, favorites, n_workers=n_workers)
+  return aggregates['users'], aggregates['products']
+
+def district_boundary_fingerprint():
+  """행정구역 경계 파일 지문 (파일이 없으면 고정값)"""
+  from district_join import DISTRICT_BOUNDARY_PATH
+
+  return files_fingerprint({'district_boundaries': DISTRICT_BOUNDARY_PATH})
+
+@st.cache_resource(max_entries=1)
+def get_district_index(boundaries):
+  """행정구역 경계 STRtree 인덱스 (경계 파일 지문이 바뀌면 다시 읽음, 파일이 없으면 None)"""
+  from district_join import DistrictIndex
+
+  return DistrictIndex.from_file()
+
+@st.cache_data
+def load_districts(snapshot, boundaries, _data, table, address_column):
+  """좌표 공간 조인으로 구 할당 (스냅샷·경계 파일당 한 번 계산, 경계 밖이면 주소 정규식 사용)"""
+  from district_join import assign_districts
+
+  return assign_districts(_data[table], address_column, get_district_index(boundaries))
+
+@st.cache_data
+def load_savings(snapshot, boundaries, _data):
+  """공동구매 절약 효과 요약과 카테고리/구별 1인당 절약액 분포 (스냅샷당 한 번 계산)"""
+  import pandas as pd
+  from savings import SavingsChain, savings_distribution, savings_summary
+
+  chain = SavingsChain(_data['group_boards'], _data['group_products'], _data['products'],
+                       _data.get('participants'))
+  savings = chain.savings_per_participant
+
+  categories = chain.board_categories(_data.get('categories', pd.DataFrame()))
+  by_category = savings_distribution(categories, savings, chain.participants)
+
+  by_district = None
+  if 'location' in _data['group_boards'].columns:
+    districts = chain.board_labels(load_districts(snapshot, boundaries, _data, 'group_boards', 'location'))
+    by_district = savings_distribution(districts, savings, chain.participants)
+
+  return savings_summary(chain), by_category, by_district
+
 def convert_date_columns(data):
   """날짜 컬럼 변환"""
+  import pandas as pd
+
   date_columns = {
       'products': ['created_at'],
       'group_boards': ['created_at', 'deadline', 'updated_at'],
@@ -116,62 +202,20 @@ def convert_date_columns(data):
             pass
   return data
 
-def extract_district_from_address(address):
-  """주소에서 구 단위 추출"""
-  if pd.isna(address):
-    return "기타"
-
-  # 구 단위 추출 (예: "서울특별시 강남구 역삼동" -> "강남구")
-  district_pattern = r'([가-힣]+구)'
-  match = re.search(district_pattern, str(address))
-  if match:
-    return match.group(1)
-
-  # 구가 없으면 시 단위 추출
-  city_pattern = r'([가-힣]+시)'
-  match = re.search(city_pattern, str(address))
-  if match:
-    return match.group(1)
-
-  return "기타"
-
-def main():
-  # 제목
-  st.markdown("<h1 class='dashboard-title'>뭉치 운영자 대시보드</h1>", unsafe_allow_html=True)
-
-  # 데이터 로드
-  data = load_data()
-  data = convert_date_columns(data)
-
-  # 기본 통계 계산
-  total_products = len(data.get('products', pd.DataFrame()))
-  total_users = len(data.get('users', pd.DataFrame()))
-  total_participants = len(data.get('participants', pd.DataFrame()))
-  total_groups = len(data.get('group_boards', pd.DataFrame()))
-
-  # 찜하기 관련 전역 변수 계산
-  total_favorites = 0
-  unique_products = 0
-  unique_users = 0
-
-  if not data.get('favorite', pd.DataFrame()).empty:
-    total_favorites = len(data['favorite'])
-    unique_products = data['favorite']['product_id'].nunique()
-    unique_users = data['favorite']['user_id'].nunique()
-
+def render_landing_kpis(kpis):
+  """사이드바 현황과 핵심 성과 지표 행 표시"""
   # 사이드바
   st.sidebar.markdown("## 플랫폼 현황")
 
   st.sidebar.markdown(f"""
     <div class="sidebar-metric">
         <h4>전체 현황</h4>
-        <p>• 등록 상품: <strong>{total_products:,}개</strong></p>
-        <p>• 가입 사용자: <strong>{total_users:,}명</strong></p>
-        <p>• 공구 참여: <strong>{total_participants:,}건</strong></p>
+        <p>• 등록 상품: <strong>{kpis['total_products']:,}개</strong></p>
+        <p>• 가입 사용자: <strong>{kpis['total_users']:,}명</strong></p>
+        <p>• 공구 참여: <strong>{kpis['total_participants']:,}건</strong></p>
     </div>
     """, unsafe_allow_html=True)
 
-  # KPI 계산
   st.markdown("## 핵심 성과 지표")
 
   col1, col2, col3, col4 = st.columns(4)
@@ -179,42 +223,372 @@ def main():
   with col1:
     st.metric(
         label="총 상품 수",
-        value=f"{total_products:,}개"
+        value=f"{kpis['total_products']:,}개"
     )
 
   with col2:
     st.metric(
         label="총 사용자 수",
-        value=f"{total_users:,}명"
+        value=f"{kpis['total_users']:,}명"
     )
 
   with col3:
-    # 거래 완료율 계산
-    if not data.get('participants', pd.DataFrame()).empty and 'trade_completed' in data['participants'].columns:
-      completed = data['participants']['trade_completed'].sum()
-      total = len(data['participants'])
-      completion_rate = (completed / total) * 100
+    if kpis['completion_rate'] is not None:
       st.metric(
           label="거래 완료율",
-          value=f"{completion_rate:.1f}%"
+          value=f"{kpis['completion_rate']:.1f}%"
       )
     else:
       st.metric(label="거래 완료율", value="데이터 없음")
 
   with col4:
-    # 리더 비율 수정 - 'L'이 포함된 role을 리더로 인식
-    if not data.get('participants', pd.DataFrame()).empty and 'role' in data['participants'].columns:
-      # 'L'이 포함된 역할을 리더로 분류
-      leaders = data['participants']['role'].str.contains('L', case=False, na=False).sum()
-      total = len(data['participants'])
-      leader_ratio = (leaders / total) * 100
+    if kpis['leader_ratio'] is not None:
       st.metric(
           label="리더 비율",
-          value=f"{leader_ratio:.1f}%"
+          value=f"{kpis['leader_ratio']:.1f}%"
       )
     else:
       st.metric(label="리더 비율", value="데이터 없음")
 
+# ---- 차트 생성 함수 (figure 캐시 미스일 때만 호출) ----
+
+def build_participation_fig(participation_counts, height):
+  """사용자별 참여 횟수 분포 차트"""
+  import pandas as pd
+  import plotly.express as px
+
+  participation_dist = participation_counts.value_counts().sort_index()
+
+  if len(participation_dist) == 0:
+    return None
+
+  chart_data = pd.DataFrame({
+      '참여 횟수': participation_dist.index,
+      '사용자 수': participation_dist.values
+  })
+
+  fig = px.bar(
+      chart_data,
+      x='참여 횟수',
+      y='사용자 수',
+      title="사용자별 참여 횟수 분포",
+      color='사용자 수',
+      color_continuous_scale='Blues'
+  )
+  fig.update_layout(height=height)
+  return fig
+
+def build_role_fig(data, height):
+  """참여자 역할 분포 차트"""
+  import plotly.express as px
+
+  # 'L'이 포함된 역할을 리더로 재분류
+  role_cleaned = data['participants']['role'].apply(
+      lambda x: '리더' if 'L' in str(x) else '참여자'
+  )
+  role_counts = role_cleaned.value_counts()
+
+  fig = px.pie(
+      values=role_counts.values,
+      names=role_counts.index,
+      title="참여자 역할 분포",
+      color_discrete_sequence=['#ff9999', '#66b3ff']
+  )
+  fig.update_layout(height=height)
+  return fig
+
+def build_category_products_fig(data, top_n, height):
+  """카테고리별 상품 수 차트 (카테고리 이름 기준)"""
+  import pandas as pd
+  import plotly.express as px
+
+  # 상품과 카테고리 조인
+  products_with_category = pd.merge(
+      data['products'],
+      data['categories'],
+      left_on='category_id',
+      right_on='id',
+      how='left'
+  )
+  category_counts = products_with_category['large_category'].value_counts().head(top_n)
+
+  chart_data = pd.DataFrame({
+      '카테고리': category_counts.index,
+      '상품 수': category_counts.values
+  })
+
+  fig = px.bar(
+      chart_data,
+      x='상품 수',
+      y='카테고리',
+      orientation='h',
+      title=f"카테고리별 상품 수 (Top {top_n})",
+      color='상품 수',
+      color_continuous_scale='Greens'
+  )
+  fig.update_layout(height=height)
+  return fig
+
+def build_category_products_by_id_fig(data, top_n, height):
+  """카테고리별 상품 수 차트 (카테고리 정보가 없으면 ID로 표시)"""
+  import pandas as pd
+  import plotly.express as px
+
+  category_counts = data['products']['category_id'].value_counts().head(top_n)
+  chart_data = pd.DataFrame({
+      '카테고리': [f'카테고리 {cat_id}' for cat_id in category_counts.index],
+      '상품 수': category_counts.values
+  })
+
+  fig = px.bar(
+      chart_data,
+      x='상품 수',
+      y='카테고리',
+      orientation='h',
+      title=f"카테고리별 상품 수 (Top {top_n})",
+      color='상품 수',
+      color_continuous_scale='Greens'
+  )
+  fig.update_layout(height=height)
+  return fig
+
+def build_price_histogram_fig(price_data, nbins, height):
+  """상품 가격 분포 차트"""
+  import plotly.express as px
+
+  fig = px.histogram(
+      x=price_data,
+      nbins=nbins,
+      title="상품 가격 분포",
+      labels={'x': '가격(원)', 'y': '상품 수'}
+  )
+  fig.update_layout(height=height)
+  return fig
+
+def build_price_range_fig(price_dist, height):
+  """가격대별 상품 분포 차트"""
+  import pandas as pd
+  import plotly.express as px
+
+  chart_data = pd.DataFrame({
+      '가격대': price_dist.index,
+      '상품 수': price_dist.values
+  })
+
+  fig = px.pie(
+      chart_data,
+      values='상품 수',
+      names='가격대',
+      title="가격대별 상품 분포",
+      color_discrete_sequence=px.colors.qualitative.Set3
+  )
+  fig.update_layout(height=height)
+  return fig
+
+def build_savings_fig(distribution, label_name, title, color_scale, top_n, height):
+  """라벨별 참여자 1인당 절약액 분포 차트 (막대 = 중앙값, 오차 막대 = 사분위 범위)"""
+  import pandas as pd
+  import plotly.express as px
+
+  top = distribution.head(top_n)
+  chart_data = pd.DataFrame({
+      label_name: top.index,
+      '1인당 절약액 중앙값(원)': top['median'].values,
+      '공구방 수': top['boards'].values
+  })
+
+  fig = px.bar(
+      chart_data,
+      x=label_name,
+      y='1인당 절약액 중앙값(원)',
+      error_y=(top['p75'] - top['median']).values,
+      error_y_minus=(top['median'] - top['p25']).values,
+      title=title,
+      color='공구방 수',
+      color_continuous_scale=color_scale
+  )
+  fig.update_layout(height=height)
+  return fig
+
+def build_top_favorites_fig(products_with_favorites, height, margin_left):
+  """인기 상품 찜 Top 10 차트"""
+  import pandas as pd
+  import plotly.express as px
+
+  chart_data = pd.DataFrame({
+      '상품명': products_with_favorites['display_name'],
+      '찜 횟수': products_with_favorites['favorite_count']
+  })
+
+  fig = px.bar(
+      chart_data,
+      x='찜 횟수',
+      y='상품명',
+      orientation='h',
+      title="인기 상품 찜 Top 10",
+      color='찜 횟수',
+      color_continuous_scale='Oranges'
+  )
+  fig.update_layout(height=height, margin=dict(l=margin_left))  # 왼쪽 여백 증가
+  return fig
+
+def build_user_favorite_activity_fig(user_favorite_counts, height):
+  """사용자별 찜 활동도 분포 차트"""
+  import pandas as pd
+  import plotly.express as px
+
+  favorites_activity = user_favorite_counts.value_counts().sort_index()
+
+  chart_data = pd.DataFrame({
+      '찜 개수': favorites_activity.index,
+      '사용자 수': favorites_activity.values
+  })
+
+  fig = px.bar(
+      chart_data,
+      x='찜 개수',
+      y='사용자 수',
+      title="사용자별 찜 활동도 분포",
+      color='사용자 수',
+      color_continuous_scale='Blues'
+  )
+  fig.update_layout(height=height)
+  return fig
+
+def build_monthly_favorites_fig(monthly_favorites, height):
+  """월별 찜하기 추이 차트"""
+  import pandas as pd
+  import plotly.express as px
+
+  chart_data = pd.DataFrame({
+      '월': [str(m) for m in monthly_favorites.index],
+      '찜 횟수': monthly_favorites.values
+  })
+
+  fig = px.line(
+      chart_data,
+      x='월',
+      y='찜 횟수',
+      title="월별 찜하기 추이",
+      markers=True
+  )
+  fig.update_layout(height=height)
+  return fig
+
+def build_fill_survival_fig(survival, height):
+  """마감 대비 공구방 미모집 생존 곡선 차트"""
+  import pandas as pd
+  import plotly.express as px
+
+  # 시작점(경과 0%, 생존 100%)부터 계단형으로 표시
+  chart_data = pd.DataFrame({
+      '마감 대비 경과(%)': [0.0] + list(survival['time'] * 100),
+      '미모집 공구방 비율(%)': [100.0] + list(survival['survival'] * 100)
+  })
+
+  fig = px.line(
+      chart_data,
+      x='마감 대비 경과(%)',
+      y='미모집 공구방 비율(%)',
+      title="공구방 모집 생존 곡선 (Kaplan–Meier)",
+      line_shape='hv'
+  )
+  fig.update_layout(height=height)
+  fig.update_yaxes(range=[0, 105])
+  return fig
+
+def build_district_choropleth_fig(index, districts, count_label, title, color_scale, height):
+  """구별 분포 choropleth 지도"""
+  import plotly.express as px
+  from district_join import district_choropleth
+
+  chart_data = district_choropleth(index, districts, count_label)
+
+  fig = px.choropleth_map(
+      chart_data,
+      geojson=index.geojson(),
+      locations='district',
+      color=count_label,
+      title=title,
+      color_continuous_scale=color_scale,
+      map_style='carto-positron',
+      center={'lat': 37.5665, 'lon': 126.9780},
+      zoom=10,
+      opacity=0.6
+  )
+  fig.update_layout(height=height)
+  return fig
+
+def build_district_fig(districts, count_label, title, color_scale, top_n, height):
+  """지역별 분포 차트 (구 단위)"""
+  import pandas as pd
+  import plotly.express as px
+
+  district_counts = districts.value_counts().head(top_n)
+
+  chart_data = pd.DataFrame({
+      '지역': district_counts.index,
+      count_label: district_counts.values
+  })
+
+  fig = px.bar(
+      chart_data,
+      x='지역',
+      y=count_label,
+      title=title,
+      color=count_label,
+      color_continuous_scale=color_scale
+  )
+  fig.update_layout(height=height)
+  fig.update_xaxes(tickangle=45)
+  return fig
+
+def main():
+  # 제목
+  st.markdown("<h1 class='dashboard-title'>뭉치 운영자 대시보드</h1>", unsafe_allow_html=True)
+
+  # 콜드 스타트: 데이터 파일이 바뀌지 않았으면 사이드카의 KPI를 먼저 표시
+  fingerprint = files_fingerprint(resolve_csv_paths())
+  landing_kpis = read_landing_kpis(LANDING_KPIS_PATH, fingerprint) if COLD_START else None
+  if landing_kpis is not None:
+    render_landing_kpis(landing_kpis)
+
+  # 데이터 로드 (pandas는 사이드카 KPI 표시 뒤에 import)
+  import pandas as pd
+  data = load_data(fingerprint)
+  data = convert_date_columns(data)
+  snapshot = load_snapshot_hash(fingerprint)
+  # 구 할당·지역 차트는 데이터 스냅샷과 경계 파일 모두에 의존
+  boundaries = district_boundary_fingerprint()
+
+  # 사용자/상품 단위 집계 (참여 횟수, 찜 수 등)
+  user_stats, product_stats = load_user_aggregates(snapshot, data)
+  participation_counts = user_stats.loc[user_stats['participation_count'] > 0, 'participation_count']
+  user_favorite_counts = user_stats.loc[user_stats['favorite_count'] > 0, 'favorite_count']
+  product_favorite_counts = product_stats['favorite_count'].sort_values(ascending=False, kind='stable')
+
+  # 기본 통계 계산
+  total_products = len(data.get('products', pd.DataFrame()))
+  total_users = len(data.get('users', pd.DataFrame()))
+  total_participants = len(data.get('participants', pd.DataFrame()))
+  total_groups = len(data.get('group_boards', pd.DataFrame()))
+
+  # 찜하기 관련 전역 변수 계산
+  total_favorites = 0
+  unique_products = 0
+  unique_users = 0
+
+  if not data.get('favorite', pd.DataFrame()).empty:
+    total_favorites = len(data['favorite'])
+    unique_products = len(product_favorite_counts)
+    unique_users = len(user_favorite_counts)
+
+  if landing_kpis is None:
+    landing_kpis = compute_landing_kpis(data)
+    if COLD_START:
+      write_landing_kpis(LANDING_KPIS_PATH, fingerprint, landing_kpis)
+    render_landing_kpis(landing_kpis)
+
   # 탭 구성
   tab1, tab2, tab3, tab4, tab5 = st.tabs([
       "사용자 참여 현황", "상품 및 카테고리", "찜하기 분석", "지역별 현황", "데이터 인사이트"
@@ -228,48 +602,22 @@ def main():
     with col1:
       # 사용자별 참여 횟수 분포
       if not data.get('participants', pd.DataFrame()).empty:
-        user_participation = data['participants'].groupby('user_id').size()
-        participation_dist = user_participation.value_counts().sort_index()
-
-        if len(participation_dist) > 0:
-          chart_data = pd.DataFrame({
-              '참여 횟수': participation_dist.index,
-              '사용자 수': participation_dist.values
-          })
-
-          fig = px.bar(
-              chart_data,
-              x='참여 횟수',
-              y='사용자 수',
-              title="사용자별 참여 횟수 분포",
-              color='사용자 수',
-              color_continuous_scale='Blues'
-          )
-          fig.update_layout(height=400)
+        fig = cached_figure(snapshot, "participation_distribution",
+                            partial(build_participation_fig, participation_counts), height=400)
+        if fig is not None:
           st.plotly_chart(fig, use_container_width=True, key="participation_distribution")
 
     with col2:
       # 수정된 역할별 분포
       if not data.get('participants', pd.DataFrame()).empty and 'role' in data['participants'].columns:
-        # 'L'이 포함된 역할을 리더로 재분류
-        data['participants']['role_cleaned'] = data['participants']['role'].apply(
-            lambda x: '리더' if 'L' in str(x) else '참여자'
-        )
-        role_counts = data['participants']['role_cleaned'].value_counts()
-
-        fig = px.pie(
-            values=role_counts.values,
-            names=role_counts.index,
-            title="참여자 역할 분포",
-            color_discrete_sequence=['#ff9999', '#66b3ff']
-        )
-        fig.update_layout(height=400)
+        fig = cached_figure(snapshot, "role_distribution",
+                            partial(build_role_fig, data), height=400)
         st.plotly_chart(fig, use_container_width=True, key="role_distribution")
 
     # 참여 현황 요약
     if not data.get('participants', pd.DataFrame()).empty:
-      total_unique_users = data['participants']['user_id'].nunique()
-      avg_participation = data['participants'].groupby('user_id').size().mean()
+      total_unique_users = len(participation_counts)
+      avg_participation = participation_counts.mean()
 
       st.markdown(f"""
             <div class="insight-box">
@@ -280,6 +628,46 @@ def main():
             </div>
             """, unsafe_allow_html=True)
 
+    # 공구방 모집 마감 분석 - 정원 도달 시간과 마감 대비 생존 곡선
+    if (not data.get('group_boards', pd.DataFrame()).empty and not data.get('participants', pd.DataFrame()).empty and
+            {'total_users', 'deadline', 'created_at'} <= set(data['group_boards'].columns)):
+      board_fill, survival = load_board_survival(snapshot, data)
+
+      if len(survival) > 0:
+        st.markdown("### 공구방 모집 마감 분석")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+          fig = cached_figure(snapshot, "fill_survival",
+                              partial(build_fill_survival_fig, survival), height=400)
+          st.plotly_chart(fig, use_container_width=True, key="fill_survival")
+
+        with col2:
+          # 마감 전 모집 완료 또는 마감이 지난 공구방만 결과가 확정된 것으로 본다
+          resolved = board_fill['filled_before_deadline'] | board_fill['deadline_passed']
+          in_progress = int((~resolved).sum())
+          filled_rate_text = (f"{board_fill.loc[resolved, 'filled_before_deadline'].mean() * 100:.1f}%"
+                              if resolved.any() else "데이터 없음")
+          median_fill_hours = board_fill['fill_hours'].median()
+          median_fill_text = f"{median_fill_hours:.1f}시간" if pd.notna(median_fill_hours) else "데이터 없음"
+          # 관측이 마감 시점(경과 100%)까지 닿은 경우에만 마감 시점 생존 확률을 읽는다
+          if survival['time'].max() >= 1.0:
+            at_deadline = survival.loc[survival['time'] <= 1.0, 'survival']
+            unfilled_text = f"{(at_deadline.iloc[-1] if len(at_deadline) > 0 else 1.0) * 100:.1f}%"
+          else:
+            unfilled_text = "마감 전 (관측 중)"
+
+          st.markdown(f"""
+                <div class="insight-box">
+                    <strong>모집 마감 요약</strong><br>
+                    • 마감 전 정원 모집 완료율: <strong>{filled_rate_text}</strong> (결과 확정 {int(resolved.sum()):,}개 기준)<br>
+                    • 모집 진행 중 공구방: <strong>{in_progress:,}개</strong><br>
+                    • 정원 도달까지 중앙 소요 시간: <strong>{median_fill_text}</strong><br>
+                    • 마감 시점 미모집 공구방 비율: <strong>{unfilled_text}</strong>
+                </div>
+                """, unsafe_allow_html=True)
+
   with tab2:
     st.markdown("### 상품 및 카테고리 분석")
 
@@ -290,52 +678,14 @@ def main():
       if (not data.get('products', pd.DataFrame()).empty and 'category_id' in data['products'].columns and
               not data.get('categories', pd.DataFrame()).empty):
 
-        # 상품과 카테고리 조인
-        products_with_category = pd.merge(
-            data['products'],
-            data['categories'],
-            left_on='category_id',
-            right_on='id',
-            how='left'
-        )
-
-        if 'large_category' in products_with_category.columns:
-          category_counts = products_with_category['large_category'].value_counts().head(10)
-
-          chart_data = pd.DataFrame({
-              '카테고리': category_counts.index,
-              '상품 수': category_counts.values
-          })
-
-          fig = px.bar(
-              chart_data,
-              x='상품 수',
-              y='카테고리',
-              orientation='h',
-              title="카테고리별 상품 수 (Top 10)",
-              color='상품 수',
-              color_continuous_scale='Greens'
-          )
-          fig.update_layout(height=500)
+        if 'large_category' in data['categories'].columns:
+          fig = cached_figure(snapshot, "category_products",
+                              partial(build_category_products_fig, data), top_n=10, height=500)
           st.plotly_chart(fig, use_container_width=True, key="category_products")
         else:
           # 카테고리 정보가 없으면 ID로 표시
-          category_counts = data['products']['category_id'].value_counts().head(10)
-          chart_data = pd.DataFrame({
-              '카테고리': [f'카테고리 {cat_id}' for cat_id in category_counts.index],
-              '상품 수': category_counts.values
-          })
-
-          fig = px.bar(
-              chart_data,
-              x='상품 수',
-              y='카테고리',
-              orientation='h',
-              title="카테고리별 상품 수 (Top 10)",
-              color='상품 수',
-              color_continuous_scale='Greens'
-          )
-          fig.update_layout(height=500)
+          fig = cached_figure(snapshot, "category_products_by_id",
+                              partial(build_category_products_by_id_fig, data), top_n=10, height=500)
           st.plotly_chart(fig, use_container_width=True, key="category_products_by_id")
 
     with col2:
@@ -344,13 +694,8 @@ def main():
         # 가격 데이터가 있는지 확인
         price_data = data['products']['price'].dropna()
         if len(price_data) > 0:
-          fig = px.histogram(
-              x=price_data,
-              nbins=25,
-              title="상품 가격 분포",
-              labels={'x': '가격(원)', 'y': '상품 수'}
-          )
-          fig.update_layout(height=400)
+          fig = cached_figure(snapshot, "price_distribution",
+                              partial(build_price_histogram_fig, price_data), nbins=25, height=400)
           st.plotly_chart(fig, use_container_width=True, key="price_distribution")
         else:
           st.warning("가격 데이터가 없습니다.")
@@ -372,19 +717,8 @@ def main():
 
         with col1:
           # 가격대별 분포 시각화
-          chart_data = pd.DataFrame({
-              '가격대': price_dist.index,
-              '상품 수': price_dist.values
-          })
-
-          fig = px.pie(
-              chart_data,
-              values='상품 수',
-              names='가격대',
-              title="가격대별 상품 분포",
-              color_discrete_sequence=px.colors.qualitative.Set3
-          )
-          fig.update_layout(height=400)
+          fig = cached_figure(snapshot, "price_range_pie",
+                              partial(build_price_range_fig, price_dist), height=400)
           st.plotly_chart(fig, use_container_width=True, key="price_range_pie")
 
         with col2:
@@ -419,6 +753,46 @@ def main():
             total_count=len(price_data)
         ), unsafe_allow_html=True)
 
+    # 공동구매 절약 효과 - 공구방 -> 공구 상품 -> 상품 판매 단위 가격 비교
+    if (not data.get('group_boards', pd.DataFrame()).empty and not data.get('group_products', pd.DataFrame()).empty and
+            not data.get('products', pd.DataFrame()).empty and 'group_product_id' in data['group_boards'].columns):
+      savings, savings_by_category, savings_by_district = load_savings(snapshot, boundaries, data)
+
+      if savings['matched_boards'] > 0:
+        st.markdown("### 공동구매 절약 효과")
+
+        # 할인은 같은 판매 단위의 공구 가격과 단품 가격 차이로만 계산한다 (quantity로 나눈 단가 비교는 하지 않음)
+        if savings['discounted_boards'] > 0:
+          col1, col2 = st.columns(2)
+
+          with col1:
+            fig = cached_figure(snapshot, "savings_by_category",
+                                partial(build_savings_fig, savings_by_category, '카테고리',
+                                        "카테고리별 참여자 1인당 절약액", 'Greens'),
+                                top_n=10, height=400)
+            st.plotly_chart(fig, use_container_width=True, key="savings_by_category")
+
+          with col2:
+            if savings_by_district is not None:
+              fig = cached_figure(snapshot, "savings_by_district",
+                                  partial(build_savings_fig, savings_by_district, '지역',
+                                          "지역별 참여자 1인당 절약액 (구 단위)", 'Reds'),
+                                  key_params={'boundaries': boundaries}, top_n=10, height=400)
+              st.plotly_chart(fig, use_container_width=True, key="savings_by_district")
+        else:
+          st.info("단품보다 싸게 등록된 공구 상품이 없어 할인 효과를 표시하지 않습니다 (공구 가격 = 단품 판매 가격).")
+
+        st.markdown(f"""
+                <div class="insight-box">
+                    <strong>절약 효과 요약</strong><br>
+                    • 단품 가격 비교 가능 공구방: <strong>{savings['matched_boards']:,}개</strong> / {savings['boards']:,}개<br>
+                    • 단품보다 싼 공구방: <strong>{savings['discounted_boards']:,}개</strong><br>
+                    • 단품 대비 할인율 중앙값 (같은 판매 단위 기준): <strong>{savings['median_discount_rate'] * 100:.1f}%</strong><br>
+                    • 참여자 1인당 분담액 중앙값: <strong>{savings['median_cost_per_participant']:,.0f}원</strong><br>
+                    • 참여 인원 기준 총 절약액: <strong>{savings['realized_savings']:,.0f}원</strong>
+                </div>
+                """, unsafe_allow_html=True)
+
   with tab3:
     st.markdown("### 찜하기 분석")
 
@@ -427,7 +801,7 @@ def main():
     with col1:
       # 상품별 찜 횟수 TOP 10 차트 (상품명과 함께)
       if not data.get('favorite', pd.DataFrame()).empty and 'product_id' in data['favorite'].columns:
-        product_favorites = data['favorite']['product_id'].value_counts().head(10)
+        product_favorites = product_favorite_counts.head(10)
 
         if len(product_favorites) > 0 and not data.get('products', pd.DataFrame()).empty:
           # products 테이블과 조인하여 상품명 가져오기
@@ -450,21 +824,9 @@ def main():
               products_with_favorites['product_id'].astype(str).apply(lambda x: f'상품 {x}')
           ).apply(lambda x: x[:25] + '...' if len(str(x)) > 25 else str(x))
 
-          chart_data = pd.DataFrame({
-              '상품명': products_with_favorites['display_name'],
-              '찜 횟수': products_with_favorites['favorite_count']
-          })
-
-          fig = px.bar(
-              chart_data,
-              x='찜 횟수',
-              y='상품명',
-              orientation='h',
-              title="인기 상품 찜 Top 10",
-              color='찜 횟수',
-              color_continuous_scale='Oranges'
-          )
-          fig.update_layout(height=500, margin=dict(l=200))  # 왼쪽 여백 증가
+          fig = cached_figure(snapshot, "top_favorites",
+                              partial(build_top_favorites_fig, products_with_favorites),
+                              height=500, margin_left=200)
           st.plotly_chart(fig, use_container_width=True, key="top_favorites")
 
           # 인기 상품 전체 이름 표시
@@ -478,23 +840,8 @@ def main():
     with col2:
       # 사용자별 찜 활동도 분석
       if not data.get('favorite', pd.DataFrame()).empty and 'user_id' in data['favorite'].columns:
-        user_favorites = data['favorite']['user_id'].value_counts()
-        favorites_activity = user_favorites.value_counts().sort_index()
-
-        chart_data = pd.DataFrame({
-            '찜 개수': favorites_activity.index,
-            '사용자 수': favorites_activity.values
-        })
-
-        fig = px.bar(
-            chart_data,
-            x='찜 개수',
-            y='사용자 수',
-            title="사용자별 찜 활동도 분포",
-            color='사용자 수',
-            color_continuous_scale='Blues'
-        )
-        fig.update_layout(height=400)
+        fig = cached_figure(snapshot, "user_favorite_activity",
+                            partial(build_user_favorite_activity_fig, user_favorite_counts), height=400)
         st.plotly_chart(fig, use_container_width=True, key="user_favorite_activity")
 
     # 찜하기 인사이트와 사용자 찜 활동 분석을 같은 위치에서 시작
@@ -503,7 +850,7 @@ def main():
     with col1:
       # 찜하기 인사이트
       if not data.get('favorite', pd.DataFrame()).empty and 'product_id' in data['favorite'].columns:
-        product_favorites = data['favorite']['product_id'].value_counts()
+        product_favorites = product_favorite_counts
         if len(product_favorites) > 0:
           # 가장 인기있는 상품의 실제 이름 찾기
           top_product_id = product_favorites.index[0]
@@ -529,7 +876,7 @@ def main():
     with col2:
       # 사용자 찜 활동 분석
       if not data.get('favorite', pd.DataFrame()).empty and 'user_id' in data['favorite'].columns:
-        user_favorites = data['favorite']['user_id'].value_counts()
+        user_favorites = user_favorite_counts
         high_activity_users = (user_favorites >= 5).sum()
         avg_favorites = user_favorites.mean()
 
@@ -552,26 +899,15 @@ def main():
         if len(monthly_favorites) > 1:
           st.markdown("### 월별 찜하기 트렌드")
 
-          chart_data = pd.DataFrame({
-              '월': [str(m) for m in monthly_favorites.index],
-              '찜 횟수': monthly_favorites.values
-          })
-
-          fig = px.line(
-              chart_data,
-              x='월',
-              y='찜 횟수',
-              title="월별 찜하기 추이",
-              markers=True
-          )
-          fig.update_layout(height=400)
+          fig = cached_figure(snapshot, "monthly_favorites_trend",
+                              partial(build_monthly_favorites_fig, monthly_favorites), height=400)
           st.plotly_chart(fig, use_container_width=True, key="monthly_favorites_trend")
 
     # 찜하기 통계 및 요약 (페이지 하단)
     if not data.get('favorite', pd.DataFrame()).empty:
       total_favorites = len(data['favorite'])
-      unique_products = data['favorite']['product_id'].nunique()
-      unique_users = data['favorite']['user_id'].nunique()
+      unique_products = len(product_favorite_counts)
+      unique_users = len(user_favorite_counts)
 
       col1, col2, col3 = st.columns(3)
 
@@ -613,49 +949,25 @@ def main():
     with col1:
       # 지역별 사용자 분포
       if not data.get('users', pd.DataFrame()).empty and 'address' in data['users'].columns:
-        # 주소에서 구 단위 추출
-        data['users']['district'] = data['users']['address'].apply(extract_district_from_address)
-        district_counts = data['users']['district'].value_counts().head(10)
-
-        chart_data = pd.DataFrame({
-            '지역': district_counts.index,
-            '사용자 수': district_counts.values
-        })
+        # 좌표로 구 단위 할당 (경계 파일이 없으면 주소에서 추출)
+        data['users']['district'] = load_districts(snapshot, boundaries, data, 'users', 'address')
 
-        fig = px.bar(
-            chart_data,
-            x='지역',
-            y='사용자 수',
-            title="지역별 사용자 분포 (구 단위)",
-            color='사용자 수',
-            color_continuous_scale='Viridis'
-        )
-        fig.update_layout(height=400)
-        fig.update_xaxes(tickangle=45)
+        fig = cached_figure(snapshot, "regional_users",
+                            partial(build_district_fig, data['users']['district'], '사용자 수',
+                                    "지역별 사용자 분포 (구 단위)", 'Viridis'),
+                            key_params={'boundaries': boundaries}, top_n=10, height=400)
         st.plotly_chart(fig, use_container_width=True, key="regional_users")
 
     with col2:
       # 지역별 공구방 분포
       if not data.get('group_boards', pd.DataFrame()).empty and 'location' in data['group_boards'].columns:
-        # 공구방 위치에서 구 단위 추출
-        data['group_boards']['district'] = data['group_boards']['location'].apply(extract_district_from_address)
-        district_counts = data['group_boards']['district'].value_counts().head(10)
+        # 공구방 좌표로 구 단위 할당 (경계 파일이 없으면 위치 주소에서 추출)
+        data['group_boards']['district'] = load_districts(snapshot, boundaries, data, 'group_boards', 'location')
 
-        chart_data = pd.DataFrame({
-            '지역': district_counts.index,
-            '공구방 수': district_counts.values
-        })
-
-        fig = px.bar(
-            chart_data,
-            x='지역',
-            y='공구방 수',
-            title="지역별 공구방 분포 (구 단위)",
-            color='공구방 수',
-            color_continuous_scale='Reds'
-        )
-        fig.update_layout(height=400)
-        fig.update_xaxes(tickangle=45)
+        fig = cached_figure(snapshot, "regional_groups",
+                            partial(build_district_fig, data['group_boards']['district'], '공구방 수',
+                                    "지역별 공구방 분포 (구 단위)", 'Reds'),
+                            key_params={'boundaries': boundaries}, top_n=10, height=400)
         st.plotly_chart(fig, use_container_width=True, key="regional_groups")
 
     # 지역별 요약 통계
@@ -684,6 +996,15 @@ def main():
       summary_df = pd.DataFrame(summary_data)
       st.dataframe(summary_df, use_container_width=True)
 
+      # 행정구역 경계 파일이 있으면 구별 공구방 분포를 지도로 표시
+      district_index = get_district_index(boundaries)
+      if district_index is not None:
+        fig = cached_figure(snapshot, "regional_groups_map",
+                            partial(build_district_choropleth_fig, district_index, data['group_boards']['district'],
+                                    '공구방 수', "구별 공구방 분포 지도", 'Reds'),
+                            key_params={'boundaries': boundaries}, height=500)
+        st.plotly_chart(fig, use_container_width=True, key="regional_groups_map")
+
   with tab5:
     st.markdown("### 운영자를 위한 데이터 기반 인사이트")
 
@@ -693,8 +1014,8 @@ def main():
     avg_participation = 0
 
     if not data.get('participants', pd.DataFrame()).empty:
-      total_unique_users = data['participants']['user_id'].nunique()
-      avg_participation = data['participants'].groupby('user_id').size().mean()
+      total_unique_users = len(participation_counts)
+      avg_participation = participation_counts.mean()
       completion_rate = (data['participants']['trade_completed'].sum() / len(data['participants'])) * 100 if 'trade_completed' in data['participants'].columns else 0
 
     if total_favorites > 0:
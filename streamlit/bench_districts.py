@@ -0,0 +1,78 @@
+"""구 할당 벤치마크: 주소 정규식 vs 경계 폴리곤 공간 조인
+
+users/group_boards 좌표·주소를 N건으로 복제해 처리량을 비교하고,
+좌표가 속한 폴리곤을 정답으로 삼아 주소 정규식 결과의 불일치 비율을 잰다. 경계 파일이 필요하다.
+
+  - regex:    주소 정규식만 사용
+  - spatial:  STRtree 공간 조인만 (fallback 없음, 불일치 기준)
+  - spatial+fallback: 앱 경로 (assign_districts, 경계 밖·좌표 없음은 정규식)
+
+사용법 (프로젝트 루트에서):
+  python streamlit/bench_districts.py --points 1000000 --boundary data/district_boundaries.geojson
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from data_files import resolve_csv_paths
+from district_join import DISTRICT_BOUNDARY_PATH, DistrictIndex, assign_districts, extract_district_from_address
+
+
+def load_points(n_points):
+  """users 주소 + group_boards 위치 좌표를 n_points건으로 복제"""
+  paths = resolve_csv_paths()
+  users = pd.read_csv(paths['users'])[['address', 'latitude', 'longitude']]
+  boards = pd.read_csv(paths['group_boards'])[['location', 'latitude', 'longitude']]
+  points = pd.concat([users, boards.rename(columns={'location': 'address'})], ignore_index=True)
+
+  repeat = -(-n_points // len(points))
+  return pd.concat([points] * repeat, ignore_index=True).head(n_points)
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--points', type=int, default=1_000_000)
+  parser.add_argument('--boundary', default=DISTRICT_BOUNDARY_PATH)
+  args = parser.parse_args()
+
+  index = DistrictIndex.from_file(args.boundary)
+  if index is None:
+    sys.exit(f"경계 파일을 찾을 수 없습니다: {args.boundary}")
+
+  points = load_points(args.points)
+  print(f"{len(points):,} points, {len(index.names)} polygons")
+
+  latitude = points['latitude'].to_numpy()
+  longitude = points['longitude'].to_numpy()
+
+  t0 = time.perf_counter()
+  regex_districts = points['address'].apply(extract_district_from_address)
+  regex_time = time.perf_counter() - t0
+
+  t0 = time.perf_counter()
+  polygon_districts = pd.Series(index.assign(latitude, longitude), index=points.index, dtype=object)
+  spatial_time = time.perf_counter() - t0
+
+  t0 = time.perf_counter()
+  app_districts = assign_districts(points, 'address', index)
+  app_time = time.perf_counter() - t0
+
+  # 정답: 좌표가 속한 폴리곤 (좌표가 없거나 어느 폴리곤에도 속하지 않으면 정답 없음)
+  covered = polygon_districts.notna()
+  print(f"폴리곤 정답이 있는 점: {covered.mean() * 100:.2f}% (불일치는 이 점들 기준)")
+
+  print(f"{'method':<18}{'seconds':>10}{'points/s':>14}{'불일치(%)':>10}{'기타(%)':>9}")
+  for name, elapsed, districts in [('regex', regex_time, regex_districts),
+                                   ('spatial', spatial_time, polygon_districts.fillna("기타")),
+                                   ('spatial+fallback', app_time, app_districts)]:
+    mismatch = (districts[covered] != polygon_districts[covered]).mean() * 100 if covered.any() else float('nan')
+    other = (districts == "기타").mean() * 100
+    print(f"{name:<18}{elapsed:>10.3f}{len(points) / elapsed:>14,.0f}{mismatch:>10.2f}{other:>9.2f}")
+
+if __name__ == '__main__':
+  main()
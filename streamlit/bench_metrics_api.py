@@ -0,0 +1,103 @@
+"""metrics_api 부하 테스트
+
+서버를 별도 프로세스로 띄우고 여러 스레드가 keep-alive 연결로
+같은 엔드포인트를 반복 조회해 초당 요청 수를 측정한다.
+
+  - full:        조건부 헤더 없이 조회 (매번 200 + 본문)
+  - conditional: 받은 ETag로 If-None-Match 조회 (304, 재계산 없음)
+
+사용법 (프로젝트 루트에서):
+  python streamlit/bench_metrics_api.py --threads 8 --duration 5
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def free_port():
+  with socket.socket() as sock:
+    sock.bind(('127.0.0.1', 0))
+    return sock.getsockname()[1]
+
+
+def start_server(port):
+  """metrics_api 서버 프로세스 시작 후 준비될 때까지 대기"""
+  process = subprocess.Popen([sys.executable, os.path.join(APP_DIR, 'metrics_api.py'), '--port', str(port)],
+                             stdout=subprocess.PIPE, text=True)
+  process.stdout.readline()
+  return process
+
+
+def get(conn, path, headers=None):
+  conn.request('GET', path, headers=headers or {})
+  response = conn.getresponse()
+  body = response.read()
+  return response.status, response.getheader('ETag'), body
+
+
+def worker(port, path, conditional, deadline, counts, lock):
+  conn = http.client.HTTPConnection('127.0.0.1', port)
+  _, etag, _ = get(conn, path)
+  headers = {'If-None-Match': etag} if conditional else {}
+  local = Counter()
+
+  while time.perf_counter() < deadline:
+    status, _, _ = get(conn, path, headers)
+    local[status] += 1
+
+  conn.close()
+  with lock:
+    counts.update(local)
+
+
+def run(port, path, conditional, threads, duration):
+  counts = Counter()
+  lock = threading.Lock()
+  deadline = time.perf_counter() + duration
+  workers = [threading.Thread(target=worker, args=(port, path, conditional, deadline, counts, lock))
+             for _ in range(threads)]
+
+  t0 = time.perf_counter()
+  for thread in workers:
+    thread.start()
+  for thread in workers:
+    thread.join()
+  return counts, time.perf_counter() - t0
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--threads', type=int, default=8)
+  parser.add_argument('--duration', type=float, default=5.0)
+  parser.add_argument('--path', default='/metrics')
+  args = parser.parse_args()
+
+  port = free_port()
+  server = start_server(port)
+  try:
+    print(f"{'mode':<13}{'requests':>10}{'req/s':>10}  statuses")
+    for mode, conditional in [('full', False), ('conditional', True)]:
+      counts, elapsed = run(port, args.path, conditional, args.threads, args.duration)
+      total = sum(counts.values())
+      statuses = ', '.join(f"{status}: {count}" for status, count in sorted(counts.items()))
+      print(f"{mode:<13}{total:>10,}{total / elapsed:>10,.0f}  {statuses}")
+
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    _, _, body = get(conn, '/')
+    print(f"snapshot computations: {json.loads(body)['computations']}")
+  finally:
+    server.terminate()
+    server.wait()
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,95 @@
+"""절약 효과 벤치마크: pandas merge/groupby vs id 정렬 배열 체인
+
+group_boards/participants를 N배로 복제(공구방 id는 새로 부여)해
+공구방 -> 공구 상품 -> 상품 연결, 1인당 절약액, 카테고리/구별 분포 계산 시간을 비교한다.
+
+사용법 (프로젝트 루트에서):
+  python streamlit/bench_savings.py --boards 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from data_files import resolve_csv_paths
+from district_join import extract_district_from_address
+from savings import SavingsChain, savings_distribution
+
+
+def load_tables(n_boards):
+  """공구방을 n_boards건으로 복제하고 참여 기록도 같은 배수로 복제"""
+  paths = resolve_csv_paths()
+  data = {key: pd.read_csv(paths[key]) for key in
+          ['group_boards', 'group_products', 'products', 'participants', 'categories']}
+
+  boards = data['group_boards'][['id', 'total_users', 'location', 'group_product_id']]
+  participants = data['participants'][['group_board_id']]
+  repeat = -(-n_boards // len(boards))
+  stride = int(boards['id'].max()) + 1
+
+  boards = pd.concat([boards] * repeat, ignore_index=True)
+  boards['id'] += np.repeat(np.arange(repeat) * stride, len(data['group_boards']))
+  participants = pd.concat([participants] * repeat, ignore_index=True)
+  participants['group_board_id'] += np.repeat(np.arange(repeat) * stride, len(data['participants']))
+
+  # 구 할당은 district_join 벤치마크 대상이므로 고유 위치별로 한 번만 계산해 둔다
+  boards = boards.head(n_boards).copy()
+  districts = {location: extract_district_from_address(location) for location in boards['location'].unique()}
+  boards['district'] = boards['location'].map(districts)
+
+  data['group_boards'] = boards
+  data['participants'] = participants
+  return data
+
+
+def pandas_savings(data):
+  """merge 체인 + groupby quantile 기준 구현"""
+  products = data['products'][['id', 'price']].rename(columns={'id': 'product_id', 'price': 'individual_price'})
+  group_products = data['group_products'][['id', 'price', 'quantity', 'product_id', 'category_id']]
+  group_products = group_products.rename(columns={'id': 'group_product_id'}).merge(products, on='product_id')
+  categories = data['categories'][['id', 'large_category']].rename(columns={'id': 'category_id'})
+  group_products = group_products.merge(categories, on='category_id', how='left')
+
+  boards = data['group_boards'].merge(group_products, on='group_product_id')
+  joined = data['participants']['group_board_id'].value_counts()
+  boards['participants'] = boards['id'].map(joined).fillna(0)
+  boards['savings'] = (boards['individual_price'] - boards['price']) / boards['total_users']
+
+  for column in ['large_category', 'district']:
+    boards.groupby(column)['savings'].quantile([0.25, 0.5, 0.75])
+    (boards['savings'] * boards['participants']).groupby(boards[column]).sum()
+
+
+def chain_savings(data):
+  """SavingsChain + savings_distribution"""
+  chain = SavingsChain(data['group_boards'], data['group_products'], data['products'], data['participants'])
+  categories = chain.board_categories(data['categories'])
+  districts = chain.board_labels(data['group_boards']['district'])
+  savings_distribution(categories, chain.savings_per_participant, chain.participants)
+  savings_distribution(districts, chain.savings_per_participant, chain.participants)
+  return chain
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--boards', type=int, default=1_000_000)
+  args = parser.parse_args()
+
+  data = load_tables(args.boards)
+  print(f"{len(data['group_boards']):,} boards, {len(data['participants']):,} participants")
+
+  print(f"{'method':<10}{'seconds':>10}{'boards/s':>14}")
+  for name, run in [('pandas', pandas_savings), ('chain', chain_savings)]:
+    t0 = time.perf_counter()
+    run(data)
+    elapsed = time.perf_counter() - t0
+    print(f"{name:<10}{elapsed:>10.3f}{len(data['group_boards']) / elapsed:>14,.0f}")
+
+
+if __name__ == '__main__':
+  main()
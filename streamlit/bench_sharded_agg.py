@@ -0,0 +1,153 @@
+"""user_id 샤드 병렬 집계 확장성 벤치마크
+
+합성 participants/favorites 데이터로 다음을 측정한다 (워커 시작 방식은 앱과 같은 DEFAULT_START_METHOD).
+  - pandas groupby(단일 스레드) 대비 aggregate_by_user 워커 수별 처리 시간 (확장 곡선)
+  - 단계별 시간: 부모 프로세스 직렬 구간(copy, merge) vs 워커 구간(partition, aggregate)
+  - 워커 프로세스 시작 비용과, 이를 이용한 코어 수별 병렬 손익분기 행 수
+  - --sizes를 주면 행 수별로 1 워커 vs 전체 코어를 직접 비교해 이 머신의 손익분기점을 찾는다
+
+사용법 (프로젝트 루트에서):
+  python streamlit/bench_sharded_agg.py --rows 20000000 --users 2000000
+  python streamlit/bench_sharded_agg.py --sizes 250000 500000 1000000 2000000 4000000
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from sharded_agg import DEFAULT_START_METHOD, aggregate_by_user, user_shard
+
+
+def make_data(n_rows, n_users, n_boards, n_products, seed=0):
+  """합성 participants/favorites 생성"""
+  rng = np.random.default_rng(seed)
+  participants = pd.DataFrame({
+      'user_id': rng.integers(1, n_users + 1, n_rows),
+      'group_board_id': rng.integers(1, n_boards + 1, n_rows),
+      'trade_completed': rng.integers(0, 2, n_rows)
+  })
+  favorites = pd.DataFrame({
+      'user_id': rng.integers(1, n_users + 1, n_rows),
+      'product_id': rng.integers(1, n_products + 1, n_rows)
+  })
+  return participants, favorites
+
+
+def pandas_baseline(participants, favorites):
+  """기존 방식: 단일 프로세스 pandas groupby"""
+  users = participants.groupby('user_id').agg(
+      participation_count=('group_board_id', 'size'),
+      completed_sum=('trade_completed', 'sum'),
+      boards_nunique=('group_board_id', 'nunique')
+  ).join(favorites.groupby('user_id').agg(
+      favorite_count=('product_id', 'size'),
+      favorite_products_nunique=('product_id', 'nunique')
+  ), how='outer')
+  products = favorites.groupby('product_id').agg(
+      favorite_count=('user_id', 'size'),
+      favorite_users_nunique=('user_id', 'nunique')
+  )
+  return users, products
+
+
+def timed(func, *args, **kwargs):
+  t0 = time.perf_counter()
+  result = func(*args, **kwargs)
+  return time.perf_counter() - t0, result
+
+
+def worker_startup(start_method, repeat=3):
+  """워커 1개짜리 풀을 띄워 sharded_agg 작업 하나를 끝내기까지 걸리는 시간 (최솟값)"""
+  context = multiprocessing.get_context(start_method)
+  best = float('inf')
+  for _ in range(repeat):
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+      pool.submit(user_shard, np.arange(1), 1).result()
+    best = min(best, time.perf_counter() - t0)
+  return best
+
+
+def scaling(args):
+  participants, favorites = make_data(args.rows, args.users, args.boards, args.products)
+  rows = 2 * args.rows
+  print(f"{args.rows:,} participants + {args.rows:,} favorites, {args.users:,} users, "
+        f"start method {args.start_method}, {os.cpu_count()} CPU")
+
+  baseline, (expected_users, _) = timed(pandas_baseline, participants, favorites)
+  print(f"{'workers':<10}{'seconds':>10}{'rows/s':>14}{'speedup':>10}")
+  print(f"{'pandas':<10}{baseline:>10.3f}{rows / baseline:>14,.0f}{1.0:>10.2f}")
+
+  workers = 1
+  single = None
+  phases = {}
+  while workers <= args.max_workers:
+    timings = {}
+    elapsed, result = timed(aggregate_by_user, participants, favorites, n_workers=workers,
+                            start_method=args.start_method, timings=timings)
+    assert len(result['users']) == len(expected_users)
+    single = single or elapsed
+    phases = phases or timings
+    print(f"{workers:<10}{elapsed:>10.3f}{rows / elapsed:>14,.0f}{single / elapsed:>10.2f}")
+    workers *= 2
+
+  # 1 워커 실행의 단계별 시간: copy/merge는 부모에서 직렬, partition/aggregate는 워커로 나뉜다
+  serial = phases['copy'] + phases['merge']
+  parallel = phases['partition'] + phases['aggregate']
+  print()
+  print("phase (1 worker): " + ", ".join(f"{name} {seconds:.3f}s" for name, seconds in phases.items()))
+  print(f"serial share: {serial / (serial + parallel) * 100:.1f}%")
+
+  # P 코어에서 병렬이 이기려면 워커 구간 절감분 parallel * (1 - 1/P)가 워커 시작 비용보다 커야 한다
+  startup = worker_startup(args.start_method)
+  per_row = parallel / rows
+  print(f"worker startup ({args.start_method}): {startup:.3f}s, parallel work: {per_row * 1e9:.1f}ns/row")
+  print(f"{'cores':<10}{'break-even rows':>18}")
+  for cores in (2, 4, 8, 16):
+    print(f"{cores:<10}{startup / (per_row * (1 - 1 / cores)):>18,.0f}")
+
+
+def crossover(args):
+  """행 수별로 1 워커 vs 전체 코어 처리 시간을 비교해 병렬이 처음 이기는 행 수 출력"""
+  cores = os.cpu_count() or 1
+  print(f"start method {args.start_method}, {cores} CPU")
+  print(f"{'rows':>12}{'1 worker':>12}{f'{cores} workers':>14}")
+
+  found = None
+  for size in args.sizes:
+    participants, favorites = make_data(size // 2, args.users, args.boards, args.products)
+    single, _ = timed(aggregate_by_user, participants, favorites, n_workers=1)
+    parallel, _ = timed(aggregate_by_user, participants, favorites, n_workers=cores, start_method=args.start_method)
+    print(f"{size:>12,}{single:>12.3f}{parallel:>14.3f}")
+    if found is None and cores > 1 and parallel < single:
+      found = size
+
+  print(f"break-even: {found:,} rows" if found else "break-even: 병렬이 이기는 크기 없음")
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--rows', type=int, default=5_000_000)
+  parser.add_argument('--users', type=int, default=500_000)
+  parser.add_argument('--boards', type=int, default=200_000)
+  parser.add_argument('--products', type=int, default=100_000)
+  parser.add_argument('--max-workers', type=int, default=os.cpu_count())
+  parser.add_argument('--start-method', default=DEFAULT_START_METHOD)
+  parser.add_argument('--sizes', type=int, nargs='+', help="participants+favorites 전체 행 수 목록")
+  args = parser.parse_args()
+
+  if args.sizes:
+    crossover(args)
+  else:
+    scaling(args)
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,87 @@
+"""첫 KPI 표시까지 걸리는 시간 벤치마크
+
+매 회 새 파이썬 프로세스를 띄워 (컨테이너 콜드 스타트와 같은 조건)
+streamlit.testing.v1.AppTest로 실제 app.py를 실행하고, 첫 st.metric 호출까지의 시간을 측정한다.
+streamlit 자체 import 시간은 두 모드가 같으므로 따로 표시한다.
+
+  - eager: DASHBOARD_COLD_START=0. 데이터 로드·집계 후 KPI 표시
+  - cold:  사이드카가 있는 상태. 데이터 로드 전에 KPI 표시
+
+사용법 (프로젝트 루트에서):
+  python streamlit/bench_startup.py --repeat 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(APP_DIR)
+
+RUN_SCRIPT = """
+import json, sys, time
+t0 = time.perf_counter()
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+t_import = time.perf_counter()
+
+first_metric = {}
+st_metric = st.metric
+
+def metric(*args, **kwargs):
+  if not first_metric:
+    first_metric['at'] = time.perf_counter()
+    first_metric['pandas_loaded'] = 'pandas' in sys.modules
+  return st_metric(*args, **kwargs)
+
+st.metric = metric
+at = AppTest.from_file(sys.argv[1], default_timeout=600).run()
+t_done = time.perf_counter()
+assert not at.exception, [e.value for e in at.exception]
+print(json.dumps({
+    'streamlit_import': t_import - t0,
+    'to_metric': first_metric['at'] - t_import,
+    'full_run': t_done - t_import,
+    'pandas_loaded': first_metric['pandas_loaded']
+}))
+"""
+
+
+def run_once(cold_start):
+  """새 프로세스에서 앱을 한 번 실행하고 측정값 반환"""
+  env = dict(os.environ, DASHBOARD_COLD_START='1' if cold_start else '0',
+             PYTHONPATH=APP_DIR + os.pathsep + os.environ.get('PYTHONPATH', ''))
+  out = subprocess.run([sys.executable, '-c', RUN_SCRIPT, os.path.join(APP_DIR, 'app.py')],
+                       cwd=REPO_ROOT, env=env, check=True, capture_output=True, text=True).stdout
+  return json.loads(out.strip().splitlines()[-1])
+
+
+def prepare_sidecar(path):
+  """벤치마크용 사이드카 생성 (빌드 단계와 같은 사전 계산 진입점 사용)"""
+  subprocess.run([sys.executable, os.path.join(APP_DIR, 'landing_kpis.py'), '--output', path],
+                 cwd=REPO_ROOT, check=True, capture_output=True)
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--repeat', type=int, default=5)
+  args = parser.parse_args()
+
+  sys.path.insert(0, APP_DIR)
+  from landing_kpis import LANDING_KPIS_PATH
+
+  prepare_sidecar(LANDING_KPIS_PATH)
+
+  print(f"{'mode':<8}{'st import(s)':>14}{'to-metric(s)':>14}{'full run(s)':>13}  pandas@metric")
+  for mode, cold_start in [('eager', False), ('cold', True)]:
+    runs = [run_once(cold_start) for _ in range(args.repeat)]
+    row = {key: statistics.median(r[key] for r in runs) for key in ('streamlit_import', 'to_metric', 'full_run')}
+    pandas_loaded = any(r['pandas_loaded'] for r in runs)
+    print(f"{mode:<8}{row['streamlit_import']:>14.3f}{row['to_metric']:>14.3f}{row['full_run']:>13.3f}"
+          f"  {'yes' if pandas_loaded else 'no'}")
+
+
+if __name__ == '__main__':
+  main()
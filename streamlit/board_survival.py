@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+
+NS_PER_HOUR = 3600 * 10**9
+NAT_NS = np.iinfo(np.int64).min
+
+
+def _to_ns(values):
+  """datetime 계열을 int64 ns 배열로 변환 (NaT는 그대로 NaT 값 유지)"""
+  return pd.to_datetime(pd.Series(values), errors='coerce').to_numpy('datetime64[ns]').astype(np.int64)
+
+
+def observed_at(boards, participants):
+  """스냅샷의 관측 시각 (공구방 생성/수정, 참여/읽음 시각 중 가장 늦은 값, 없으면 None)
+
+  마감이 지나지 않은 미모집 공구방을 이 시각에서 중도 절단하는 데 쓴다.
+  """
+  columns = [(boards, 'created_at'), (boards, 'updated_at'), (participants, 'joined_at'), (participants, 'read_at')]
+  latest = [_to_ns(df[column]).max() for df, column in columns if column in df.columns and len(df) > 0]
+  latest = [value for value in latest if value != NAT_NS]
+  return pd.Timestamp(max(latest)) if latest else None
+
+
+class BoardJoins:
+  """공구방별 참여 시각을 한 번 정렬해 둔 구조
+
+  참여 시각은 (공구방 위치, joined_at) 순서로 하나의 배열에 정렬되고,
+  공구방 i의 참여 기록은 join_ns[starts[i]:starts[i] + counts[i]] 구간이다.
+  모든 조회는 이 배열에 대한 인덱싱과 searchsorted로 처리하며 공구방 단위 루프가 없다.
+  """
+
+  def __init__(self, boards, participants):
+    boards = boards.dropna(subset=['id'])
+    order = np.argsort(boards['id'].to_numpy(), kind='stable')
+
+    self.board_ids = boards['id'].to_numpy()[order]
+    self.capacity = boards['total_users'].fillna(0).to_numpy(np.int64)[order]
+    self.created_ns = _to_ns(boards['created_at'])[order]
+    self.deadline_ns = _to_ns(boards['deadline'])[order]
+    self.status = boards['status'].to_numpy()[order] if 'status' in boards.columns else None
+
+    # 참여 기록을 공구방 위치로 매핑 (없는 공구방의 참여는 제외)
+    join_board = participants['group_board_id'].to_numpy()
+    join_ns = _to_ns(participants['joined_at'])
+    pos = np.searchsorted(self.board_ids, join_board)
+    if len(self.board_ids) > 0:
+      pos_clipped = np.minimum(pos, len(self.board_ids) - 1)
+      valid = (self.board_ids[pos_clipped] == join_board) & (join_ns != NAT_NS)
+    else:
+      valid = np.zeros(len(pos), dtype=bool)
+    pos = pos[valid]
+    join_ns = join_ns[valid]
+
+    # 공구방 -> 참여 시각 순으로 한 번만 정렬
+    sort_idx = np.lexsort((join_ns, pos))
+    self.join_pos = pos[sort_idx]
+    self.join_ns = join_ns[sort_idx]
+
+    board_range = np.arange(len(self.board_ids))
+    self.starts = np.searchsorted(self.join_pos, board_range, side='left')
+    self.counts = np.searchsorted(self.join_pos, board_range, side='right') - self.starts
+
+  def __len__(self):
+    return len(self.board_ids)
+
+  def time_to_k(self, k):
+    """공구방별로 k번째 참여까지 걸린 시간 (ns, 도달하지 못하면 NAT_NS)
+
+    k는 스칼라 또는 공구방 수와 같은 길이의 배열.
+    참여 시각이 생성 시각보다 이르면(시계 오차, 잘못된 데이터) 음수가 그대로 반환되므로
+    도달 여부는 반드시 NAT_NS와 비교해 판단한다.
+    """
+    k = np.broadcast_to(np.asarray(k, dtype=np.int64), self.counts.shape)
+    reached = (k >= 1) & (k <= self.counts) & (self.created_ns != NAT_NS)
+    elapsed = np.full(len(self), NAT_NS, dtype=np.int64)
+    idx = self.starts[reached] + k[reached] - 1
+    elapsed[reached] = self.join_ns[idx] - self.created_ns[reached]
+    return elapsed
+
+  def fill_curve(self, fractions=(0.25, 0.5, 0.75, 1.0)):
+    """정원 대비 비율별 도달 시간 (시간 단위, 도달하지 못하면 NaN, 음수 소요 시간은 0으로 보정)"""
+    curve = {}
+    for fraction in fractions:
+      k = np.ceil(self.capacity * fraction).astype(np.int64)
+      elapsed = self.time_to_k(k)
+      curve[f"{int(fraction * 100)}%"] = np.where(elapsed != NAT_NS, np.maximum(elapsed, 0) / NS_PER_HOUR, np.nan)
+    return pd.DataFrame(curve, index=pd.Index(self.board_ids, name='board_id'))
+
+  def board_table(self, as_of=None):
+    """공구방별 마감 현황 (모집 완료 시간, 마감까지 시간, 마감 전 모집 완료 여부)
+
+    as_of(관측 시각)가 없으면 모든 공구방을 마감까지 관측한 것으로 본다.
+    as_of가 있으면 마감 전 미모집 공구방은 as_of에서 중도 절단하고 deadline_passed=False로 표시한다.
+    결과가 확정된 공구방은 filled_before_deadline | deadline_passed 이다.
+    """
+    fill_ns = self.time_to_k(self.capacity)
+    filled = (fill_ns != NAT_NS) & (self.capacity > 0)
+    # 생성 시각보다 이른 참여로 소요 시간이 음수인 공구방은 0으로 보정하고 join_before_created로 표시
+    join_before_created = filled & (fill_ns < 0)
+    fill_ns = np.where(filled, np.maximum(fill_ns, 0), 0)
+
+    has_window = (self.created_ns != NAT_NS) & (self.deadline_ns != NAT_NS)
+    window_ns = np.where(has_window, self.deadline_ns - self.created_ns, 0)
+    filled_before_deadline = filled & has_window & (fill_ns <= window_ns)
+
+    # 모집 미완료 공구방은 마감 시각(또는 관측 시각 중 이른 쪽)에서 중도 절단
+    censor_ns = window_ns.copy()
+    deadline_passed = has_window.copy()
+    if as_of is not None:
+      as_of_ns = _to_ns([as_of])[0]
+      censor_ns = np.clip(as_of_ns - self.created_ns, 0, censor_ns)
+      deadline_passed &= self.deadline_ns <= as_of_ns
+
+    table = pd.DataFrame({
+        'board_id': self.board_ids,
+        'total_users': self.capacity,
+        'participants': self.counts,
+        'fill_hours': np.where(filled, fill_ns / NS_PER_HOUR, np.nan),
+        'deadline_hours': np.where(has_window, window_ns / NS_PER_HOUR, np.nan),
+        'duration_hours': np.where(has_window, np.where(filled_before_deadline, fill_ns, censor_ns) / NS_PER_HOUR, np.nan),
+        'filled_before_deadline': filled_before_deadline,
+        'deadline_passed': deadline_passed,
+        'join_before_created': join_before_created
+    })
+    if self.status is not None:
+      table['status'] = self.status
+    return table
+
+
+def kaplan_meier(durations, events):
+  """Kaplan–Meier 생존 함수 추정
+
+  durations: 관측 시간 배열, events: 사건 발생 여부(False면 중도 절단).
+  같은 시간의 사건/절단은 묶어서 한 번에 처리한다.
+  """
+  durations = np.asarray(durations, dtype=float)
+  events = np.asarray(events, dtype=bool)
+  keep = ~np.isnan(durations)
+  durations = durations[keep]
+  events = events[keep]
+
+  times, inverse = np.unique(durations, return_inverse=True)
+  removed = np.bincount(inverse, minlength=len(times))
+  observed = np.bincount(inverse, weights=events, minlength=len(times)).astype(np.int64)
+  at_risk = len(durations) - np.concatenate(([0], np.cumsum(removed)[:-1]))
+
+  with np.errstate(divide='ignore', invalid='ignore'):
+    survival = np.cumprod(np.where(at_risk > 0, 1 - observed / at_risk, 1.0))
+
+  return pd.DataFrame({
+      'time': times,
+      'at_risk': at_risk,
+      'events': observed,
+      'censored': removed - observed,
+      'survival': survival
+  })
+
+
+def fill_survival(joins, scale='hours', as_of=None):
+  """공구방 '미모집' 생존 곡선 (모집 완료 = 사건, 마감 = 중도 절단)
+
+  scale='hours'면 생성 후 경과 시간, scale='deadline'이면 마감까지 기간 대비 비율
+  (1.0 = 마감 시점)을 시간 축으로 사용한다.
+  """
+  table = joins.board_table(as_of=as_of)
+  durations = table['duration_hours'].to_numpy()
+
+  if scale == 'deadline':
+    window = table['deadline_hours'].to_numpy()
+    durations = np.where(window > 0, durations / np.where(window > 0, window, 1), np.nan)
+  elif scale != 'hours':
+    raise ValueError(f"scale must be 'hours' or 'deadline': {scale}")
+
+  return kaplan_meier(durations, table['filled_before_deadline'].to_numpy())
@@ -0,0 +1,75 @@
+import hashlib
+import os
+
+# 테이블 이름 -> CSV 파일명
+CSV_FILES = {
+    'products': 'products_dummy_860.csv',
+    'categories': 'categories_dummy_211.csv',
+    'users': 'users_dummy_200.csv',
+    'favorite': 'favorite_products_dummy_3000_updated.csv',
+    'participants': 'participants_dummy_2312.csv',
+    'group_products': 'group_products_dummy_366.csv',
+    'group_boards': 'group_boards_dummy_366_title_change.csv'
+}
+
+# CSV 탐색 경로 (현재 작업 디렉터리 기준)
+BASE_PATHS = ['', 'data/']
+
+
+def resolve_csv_paths():
+  """테이블별 CSV 경로 탐색 (없으면 None)"""
+  paths = {}
+
+  for key, filename in CSV_FILES.items():
+    paths[key] = None
+    for base_path in BASE_PATHS:
+      filepath = base_path + filename
+      if os.path.exists(filepath):
+        paths[key] = filepath
+        break
+
+  return paths
+
+
+# 파일 경로 -> (크기, 수정 시각, 내용 해시). 같은 프로세스에서 바뀌지 않은 파일은 다시 읽지 않는다
+_content_hashes = {}
+
+
+def _content_hash(filepath, stat):
+  """파일 내용 해시 (크기·수정 시각이 같으면 이전 결과 재사용)"""
+  key = os.path.realpath(filepath)
+  cached = _content_hashes.get(key)
+  if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+    return cached[2]
+
+  hasher = hashlib.sha1()
+  with open(filepath, 'rb') as f:
+    for block in iter(lambda: f.read(1 << 20), b''):
+      hasher.update(block)
+  digest = hasher.hexdigest()
+
+  _content_hashes[key] = (stat.st_size, stat.st_mtime_ns, digest)
+  return digest
+
+
+def files_fingerprint(paths):
+  """CSV 파일 크기·내용 해시 기반 지문
+
+  경로와 수정 시각은 반영하지 않으므로 작업 디렉터리나 체크아웃 시각이 달라도
+  내용이 같으면 지문이 같다 (빌드 때 만든 사이드카를 새 컨테이너에서도 사용).
+  """
+  hasher = hashlib.sha1()
+
+  for key in sorted(paths):
+    filepath = paths[key]
+    hasher.update(key.encode('utf-8'))
+    if filepath is None:
+      continue
+    try:
+      stat = os.stat(filepath)
+      digest = _content_hash(filepath, stat)
+    except OSError:
+      continue
+    hasher.update(f"|{stat.st_size}|{digest}".encode('utf-8'))
+
+  return hasher.hexdigest()[:16]
@@ -0,0 +1,126 @@
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+# 행정구역 경계 파일 (GeoJSON/Shapefile 등 geopandas가 읽을 수 있는 형식)
+DISTRICT_BOUNDARY_PATH = os.environ.get('DISTRICT_BOUNDARY_PATH', 'data/district_boundaries.geojson')
+
+# 경계 파일에서 구 이름이 들어 있는 컬럼
+DISTRICT_NAME_COLUMN = os.environ.get('DISTRICT_NAME_COLUMN', 'name')
+
+# 한 번에 STRtree에 질의할 좌표 수
+DEFAULT_BATCH_SIZE = 200_000
+
+
+def extract_district_from_address(address):
+  """주소에서 구 단위 추출"""
+  if pd.isna(address):
+    return "기타"
+
+  # 구 단위 추출 (예: "서울특별시 강남구 역삼동" -> "강남구")
+  district_pattern = r'([가-힣]+구)'
+  match = re.search(district_pattern, str(address))
+  if match:
+    return match.group(1)
+
+  # 구가 없으면 시 단위 추출
+  city_pattern = r'([가-힣]+시)'
+  match = re.search(city_pattern, str(address))
+  if match:
+    return match.group(1)
+
+  return "기타"
+
+
+class DistrictIndex:
+  """행정구역 경계 폴리곤 STRtree 인덱스
+
+  좌표(위도/경도)를 배치 단위로 한 번에 질의해 구 이름을 할당한다.
+  경계는 EPSG:4326(위경도) 좌표계로 변환해 보관한다.
+  """
+
+  def __init__(self, boundaries, name_column=DISTRICT_NAME_COLUMN):
+    from shapely import STRtree
+
+    if boundaries.crs is not None:
+      boundaries = boundaries.to_crs(epsg=4326)
+    boundaries = boundaries[boundaries.geometry.notna()].reset_index(drop=True)
+    if name_column not in boundaries.columns:
+      raise ValueError(f"경계 파일에 구 이름 컬럼 '{name_column}'이 없습니다 (DISTRICT_NAME_COLUMN 확인): "
+                       f"{list(boundaries.columns)}")
+
+    self.boundaries = boundaries
+    self.names = boundaries[name_column].astype(str).to_numpy()
+    self.name_column = name_column
+    self.tree = STRtree(boundaries.geometry.to_numpy())
+
+  @classmethod
+  def from_file(cls, path=DISTRICT_BOUNDARY_PATH, name_column=DISTRICT_NAME_COLUMN):
+    """경계 파일에서 인덱스 생성 (파일이 없으면 None)"""
+    if not path or not os.path.exists(path):
+      return None
+
+    import geopandas as gpd
+    return cls(gpd.read_file(path), name_column=name_column)
+
+  def assign(self, latitude, longitude, batch_size=DEFAULT_BATCH_SIZE):
+    """좌표별 구 이름 (어느 폴리곤에도 속하지 않거나 좌표가 없으면 None)"""
+    import shapely
+
+    lat = np.asarray(latitude, dtype=float)
+    lon = np.asarray(longitude, dtype=float)
+    districts = np.full(len(lat), None, dtype=object)
+
+    for start in range(0, len(lat), batch_size):
+      stop = min(start + batch_size, len(lat))
+      batch_lat = lat[start:stop]
+      batch_lon = lon[start:stop]
+
+      valid = np.flatnonzero(np.isfinite(batch_lat) & np.isfinite(batch_lon))
+      if len(valid) == 0:
+        continue
+
+      points = shapely.points(batch_lon[valid], batch_lat[valid])
+      point_idx, polygon_idx = self.tree.query(points, predicate='intersects')
+
+      # 경계선 위의 점처럼 여러 폴리곤에 걸치면 첫 번째 폴리곤 사용
+      point_idx, first = np.unique(point_idx, return_index=True)
+      districts[start + valid[point_idx]] = self.names[polygon_idx[first]]
+
+    return districts
+
+  def geojson(self):
+    """choropleth용 GeoJSON (feature id = 구 이름)"""
+    features = self.boundaries[[self.name_column, 'geometry']].rename(columns={self.name_column: 'id'})
+    features = features.set_index('id', drop=False)
+    return features.__geo_interface__
+
+
+def assign_districts(df, address_column, index=None, fallback=extract_district_from_address):
+  """공간 조인으로 구 할당, 좌표가 없거나 경계 밖이면 주소 기반 fallback 사용
+
+  index가 None이면(경계 파일 없음) 전부 fallback으로 처리한다.
+  """
+  districts = pd.Series(None, index=df.index, dtype=object)
+
+  if index is not None and {'latitude', 'longitude'} <= set(df.columns):
+    districts[:] = index.assign(df['latitude'].to_numpy(), df['longitude'].to_numpy())
+
+  missing = districts.isna()
+  if fallback is not None and missing.any() and address_column in df.columns:
+    districts[missing] = df.loc[missing, address_column].map(fallback)
+
+  return districts.fillna("기타")
+
+
+def district_choropleth(index, districts, value_name):
+  """구별 건수 집계 (경계의 모든 구 포함, 없는 구는 0)"""
+  counts = pd.Series(districts).value_counts()
+  names = pd.Index(index.names).unique()
+
+  return pd.DataFrame({
+      'district': names,
+      value_name: counts.reindex(names, fill_value=0).to_numpy()
+  })
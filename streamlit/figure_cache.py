@@ -0,0 +1,76 @@
+import json
+import threading
+from collections import OrderedDict
+
+
+class FigureCache:
+  """Plotly figure JSON LRU 캐시
+
+  키는 (스냅샷 해시, 차트 ID, 뷰 파라미터)이며, 저장된 JSON의 바이트 합이
+  max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 제거한다.
+  """
+
+  def __init__(self, max_bytes=64 * 1024 * 1024):
+    self.max_bytes = max_bytes
+    self.current_bytes = 0
+    self.hits = 0
+    self.misses = 0
+    self._entries = OrderedDict()
+    self._lock = threading.Lock()
+
+  @staticmethod
+  def make_key(snapshot, chart_id, params):
+    """캐시 키 생성 (파라미터 순서와 무관)"""
+    params_key = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    return (snapshot, chart_id, params_key)
+
+  def get(self, key):
+    """캐시된 figure JSON 조회 (없으면 None)"""
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        self.misses += 1
+        return None
+      self._entries.move_to_end(key)
+      self.hits += 1
+      return entry[0]
+
+  def put(self, key, fig_json):
+    """figure JSON 저장 후 예산 초과분 제거"""
+    size = len(fig_json.encode('utf-8'))
+    if size > self.max_bytes:
+      return
+
+    with self._lock:
+      old = self._entries.pop(key, None)
+      if old is not None:
+        self.current_bytes -= old[1]
+
+      self._entries[key] = (fig_json, size)
+      self.current_bytes += size
+
+      while self.current_bytes > self.max_bytes:
+        _, (_, evicted_size) = self._entries.popitem(last=False)
+        self.current_bytes -= evicted_size
+
+  def get_or_build(self, snapshot, chart_id, build, key_params=None, **params):
+    """캐시된 figure 반환, 없으면 build(**params)로 생성 후 저장
+
+    key_params는 build에 넘기지 않고 키에만 반영한다 (예: 차트가 의존하는 경계 파일 지문).
+    build가 None을 반환하면 그릴 차트가 없는 것으로 보고 캐시하지 않는다.
+    """
+    key = self.make_key(snapshot, chart_id, dict(params, **(key_params or {})))
+    fig_json = self.get(key)
+    if fig_json is not None:
+      import plotly.io as pio
+      return pio.from_json(fig_json)
+
+    fig = build(**params)
+    if fig is None:
+      return None
+
+    self.put(key, fig.to_json())
+    return fig
+
+  def __len__(self):
+    return len(self._entries)
@@ -0,0 +1,113 @@
+"""첫 화면 KPI와 사이드카 파일
+
+빌드 단계에서 사이드카를 미리 만들어 두면 새 컨테이너의 첫 요청부터 데이터 로드 전에 KPI를 표시한다.
+
+사용법 (프로젝트 루트에서, 앱과 같은 작업 디렉터리):
+  python streamlit/landing_kpis.py
+"""
+import argparse
+import json
+import os
+import sys
+
+# 사이드카 파일 포맷 버전 (KPI 항목이 바뀌면 올린다)
+LANDING_KPIS_VERSION = 1
+
+# 사이드카 경로 (작업 디렉터리와 무관하게 앱 디렉터리에 둔다, LANDING_KPIS_PATH로 변경)
+LANDING_KPIS_PATH = os.environ.get(
+    'LANDING_KPIS_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.landing_kpis.json'))
+
+
+def compute_landing_kpis(data):
+  """첫 화면 KPI 계산 (JSON 직렬화 가능한 값만 반환)"""
+  participants = data.get('participants')
+  has_participants = participants is not None and not participants.empty
+
+  kpis = {
+      'total_products': len(data['products']) if 'products' in data else 0,
+      'total_users': len(data['users']) if 'users' in data else 0,
+      'total_participants': len(participants) if has_participants else 0,
+      'completion_rate': None,
+      'leader_ratio': None
+  }
+
+  if has_participants and 'trade_completed' in participants.columns:
+    kpis['completion_rate'] = float(participants['trade_completed'].sum() / len(participants) * 100)
+
+  if has_participants and 'role' in participants.columns:
+    # 'L'이 포함된 역할을 리더로 분류
+    leaders = participants['role'].str.contains('L', case=False, na=False).sum()
+    kpis['leader_ratio'] = float(leaders / len(participants) * 100)
+
+  return kpis
+
+
+def read_landing_kpis(path, fingerprint):
+  """사이드카 파일에서 KPI 읽기 (없거나 지문이 다르면 None)"""
+  try:
+    with open(path, encoding='utf-8') as f:
+      sidecar = json.load(f)
+  except (OSError, ValueError):
+    return None
+
+  if sidecar.get('version') != LANDING_KPIS_VERSION or sidecar.get('fingerprint') != fingerprint:
+    return None
+
+  return sidecar.get('kpis')
+
+
+def write_landing_kpis(path, fingerprint, kpis):
+  """KPI를 사이드카 파일로 저장 (임시 파일 후 교체)"""
+  sidecar = {
+      'version': LANDING_KPIS_VERSION,
+      'fingerprint': fingerprint,
+      'kpis': kpis
+  }
+
+  tmp_path = f"{path}.{os.getpid()}.tmp"
+  try:
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+      json.dump(sidecar, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+  except OSError:
+    # 읽기 전용 환경 등에서는 사이드카 없이 동작
+    try:
+      os.remove(tmp_path)
+    except OSError:
+      pass
+
+
+def main():
+  """CSV를 읽어 사이드카를 미리 생성 (이미 최신이면 그대로 둔다)"""
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--output', default=LANDING_KPIS_PATH)
+  args = parser.parse_args()
+
+  import pandas as pd
+  from data_files import files_fingerprint, resolve_csv_paths
+
+  paths = resolve_csv_paths()
+  fingerprint = files_fingerprint(paths)
+  if read_landing_kpis(args.output, fingerprint) is not None:
+    print(f"{args.output}: up to date ({fingerprint})")
+    return
+
+  # 앱의 load_data와 같이 읽을 수 없는 파일은 빈 테이블로 둔다
+  data = {}
+  for key, filepath in paths.items():
+    data[key] = pd.DataFrame()
+    if filepath is None:
+      continue
+    try:
+      data[key] = pd.read_csv(filepath)
+    except Exception:
+      continue
+
+  write_landing_kpis(args.output, fingerprint, compute_landing_kpis(data))
+  if read_landing_kpis(args.output, fingerprint) is None:
+    sys.exit(f"{args.output}: failed to write sidecar")
+  print(f"{args.output}: written ({fingerprint})")
+
+
+if __name__ == '__main__':
+  main()
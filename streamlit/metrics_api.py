@@ -0,0 +1,329 @@
+"""대시보드 KPI/분포를 JSON으로 제공하는 로컬 HTTP 서비스
+
+데이터 스냅샷마다 한 번만 계산하고, 응답에 ETag(엔드포인트별 본문 해시)와
+Last-Modified(본문이 마지막으로 바뀐 시각)를 붙여 반복 조회는 304로 응답한다.
+
+사용법 (프로젝트 루트에서):
+  python streamlit/metrics_api.py --port 8502
+
+엔드포인트:
+  /metrics        핵심 KPI (총 상품 수, 거래 완료율, 리더 비율, 찜 참여율 등)
+  /distributions  참여 횟수/찜 활동도/가격대/카테고리 분포
+  /districts      구별 사용자/공구방 요약
+  /savings        공동구매 절약 효과 요약과 카테고리/구별 1인당 절약액 분포
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import MappingProxyType
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from data_files import files_fingerprint, resolve_csv_paths
+from district_join import DISTRICT_BOUNDARY_PATH, DistrictIndex, assign_districts
+from landing_kpis import compute_landing_kpis
+from savings import SavingsChain, savings_distribution, savings_summary
+from sharded_agg import aggregate_by_user
+from snapshot import compute_snapshot_hash
+
+# 데이터 파일 변경 확인 최소 간격 (초)
+DEFAULT_CHECK_INTERVAL = 1.0
+
+
+def _distribution(counts, key_name, value_name):
+  """value_counts 결과를 [{key_name: ..., value_name: ...}] 형태로 변환"""
+  return [{key_name: key if isinstance(key, str) else int(key), value_name: int(value)}
+          for key, value in counts.items()]
+
+
+def _savings_rows(distribution, key_name):
+  """savings_distribution 결과를 [{key_name: ..., 'boards': ..., 'median': ...}] 형태로 변환"""
+  return distribution.rename_axis(key_name).reset_index().to_dict('records')
+
+
+def compute_metrics(data, district_index=None):
+  """엔드포인트별 응답 본문 계산"""
+  kpis = compute_landing_kpis(data)
+  aggregates = aggregate_by_user(data['participants'], data['favorite'], n_workers=1)
+  user_stats = aggregates['users']
+
+  participation_counts = user_stats.loc[user_stats['participation_count'] > 0, 'participation_count']
+  user_favorite_counts = user_stats.loc[user_stats['favorite_count'] > 0, 'favorite_count']
+  total_users = kpis['total_users']
+
+  metrics = dict(kpis)
+  metrics.update({
+      'total_groups': len(data['group_boards']),
+      'total_favorites': len(data['favorite']),
+      'favorited_products': len(aggregates['products']),
+      'favorite_users': len(user_favorite_counts),
+      'favorite_participation_rate': len(user_favorite_counts) / total_users * 100 if total_users else None,
+      'active_users': len(participation_counts),
+      'avg_participation': float(participation_counts.mean()) if len(participation_counts) else None
+  })
+
+  distributions = {
+      'participation': _distribution(participation_counts.value_counts().sort_index(), 'participations', 'users'),
+      'favorite_activity': _distribution(user_favorite_counts.value_counts().sort_index(), 'favorites', 'users')
+  }
+
+  products = data['products']
+  if not products.empty and 'price' in products.columns:
+    price_ranges = pd.cut(products['price'].dropna(),
+                          bins=[0, 10000, 30000, 50000, 100000, float('inf')],
+                          labels=['1만원 미만', '1-3만원', '3-5만원', '5-10만원', '10만원 이상'])
+    distributions['price_ranges'] = _distribution(price_ranges.value_counts(sort=False), 'range', 'products')
+
+  categories = data['categories']
+  if not products.empty and 'category_id' in products.columns and 'large_category' in categories.columns:
+    large_category = products['category_id'].map(categories.set_index('id')['large_category'])
+    distributions['categories'] = _distribution(large_category.value_counts().head(10), 'category', 'products')
+
+  districts = []
+  users = data['users']
+  boards = data['group_boards']
+  if not users.empty and 'address' in users.columns and not boards.empty and 'location' in boards.columns:
+    user_districts = assign_districts(users, 'address', district_index).value_counts()
+    group_districts = assign_districts(boards, 'location', district_index).value_counts()
+    for district in user_districts.index.union(group_districts.index):
+      user_count = int(user_districts.get(district, 0))
+      group_count = int(group_districts.get(district, 0))
+      districts.append({
+          'district': district,
+          'users': user_count,
+          'groups': group_count,
+          'groups_per_user': group_count / user_count if user_count else None
+      })
+
+  savings = {}
+  group_products = data['group_products']
+  if not boards.empty and not group_products.empty and not products.empty and 'group_product_id' in boards.columns:
+    chain = SavingsChain(boards, group_products, products, data['participants'])
+    categories = chain.board_categories(data['categories'])
+    savings = savings_summary(chain)
+    savings['by_category'] = _savings_rows(
+        savings_distribution(categories, chain.savings_per_participant, chain.participants), 'category')
+    if 'location' in boards.columns:
+      board_districts = chain.board_labels(assign_districts(boards, 'location', district_index))
+      savings['by_district'] = _savings_rows(
+          savings_distribution(board_districts, chain.savings_per_participant, chain.participants), 'district')
+
+  return {
+      '/metrics': metrics,
+      '/distributions': distributions,
+      '/districts': districts,
+      '/savings': savings
+  }
+
+
+def _read_tables(paths):
+  """테이블별 CSV 로드 (앱의 load_data와 같이 없거나 읽을 수 없는 파일은 빈 테이블)"""
+  data = {}
+  for key, filepath in paths.items():
+    data[key] = pd.DataFrame()
+    if filepath is None:
+      continue
+    try:
+      data[key] = pd.read_csv(filepath)
+    except Exception:
+      continue
+  return data
+
+
+def _etag(body):
+  """응답 본문 해시 ETag (데이터·경계 파일·계산 코드 중 무엇이 바뀌어도 본문이 바뀌면 달라진다)"""
+  return f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+
+
+class MetricsStore:
+  """데이터 스냅샷별로 계산된 응답을 보관
+
+  CSV 파일과 행정구역 경계 파일의 지문(크기·내용 해시)이 바뀌었을 때만 다시 로드·계산하고,
+  지문 확인도 check_interval 초에 한 번만 한다. 경계 파일이 바뀌면 DistrictIndex도 다시 읽는다.
+  계산이 실패하면 마지막으로 성공한 응답을 계속 제공하고 다음 확인 때 다시 시도한다.
+
+  응답은 (스냅샷 해시, 엔드포인트별 본문) 튜플 하나로 교체하므로 잠금 없이 읽는 요청도
+  새 ETag와 이전 본문을 섞어 받지 않는다.
+  """
+
+  def __init__(self, check_interval=DEFAULT_CHECK_INTERVAL, boundary_path=DISTRICT_BOUNDARY_PATH):
+    self.check_interval = check_interval
+    self.boundary_path = boundary_path
+    self.district_index = None
+    self.fingerprint = None
+    self.boundary_fingerprint = None
+    self._published = (None, MappingProxyType({}))
+    self.computations = 0
+    self.last_error = None
+    self._checked_at = None
+    self._lock = threading.Lock()
+
+  def current(self):
+    """(스냅샷 해시, 엔드포인트별 (JSON 본문, ETag, 마지막 수정 시각)) 반환"""
+    now = time.monotonic()
+    if self._checked_at is not None and now - self._checked_at < self.check_interval:
+      return self._published
+
+    with self._lock:
+      if self._checked_at is None or now - self._checked_at >= self.check_interval:
+        try:
+          self._refresh()
+          self.last_error = None
+        except Exception as exc:
+          # 지문은 갱신하지 않았으므로 다음 확인 때 다시 계산한다
+          self.last_error = f"{type(exc).__name__}: {exc}"
+        self._checked_at = time.monotonic()
+      return self._published
+
+  def _refresh(self):
+    paths = resolve_csv_paths()
+    boundary_fingerprint = files_fingerprint({'district_boundaries': self.boundary_path})
+    fingerprint = files_fingerprint(paths) + boundary_fingerprint
+    if fingerprint == self.fingerprint:
+      return
+
+    district_index = self.district_index
+    if boundary_fingerprint != self.boundary_fingerprint:
+      district_index = DistrictIndex.from_file(self.boundary_path)
+
+    data = _read_tables(paths)
+
+    # 본문이 그대로인 엔드포인트는 ETag와 Last-Modified를 유지한다
+    now = int(time.time())
+    previous_bodies = self._published[1]
+    bodies = {}
+    for path, body in compute_metrics(data, district_index).items():
+      body = json.dumps(body, ensure_ascii=False).encode('utf-8')
+      etag = _etag(body)
+      previous = previous_bodies.get(path)
+      bodies[path] = (body, etag, previous[2] if previous is not None and previous[1] == etag else now)
+
+    self._published = (compute_snapshot_hash(data), MappingProxyType(bodies))
+    self.district_index = district_index
+    self.boundary_fingerprint = boundary_fingerprint
+    self.fingerprint = fingerprint
+    self.computations += 1
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+  """GET 전용 JSON 핸들러 (ETag/Last-Modified 조건부 요청 지원)"""
+
+  protocol_version = 'HTTP/1.1'
+  server_version = 'MoongchiMetrics/1.0'
+  # 헤더와 본문이 따로 전송되므로 Nagle 지연(keep-alive에서 ~40ms)을 끈다
+  disable_nagle_algorithm = True
+  store = None
+
+  def do_HEAD(self):
+    self._respond(head_only=True)
+
+  def do_GET(self):
+    self._respond(head_only=False)
+
+  def _respond(self, head_only):
+    # 핸들러 인스턴스는 keep-alive 연결의 모든 요청에 재사용되므로 요청별 상태를 self에 두지 않는다
+    path = self.path.split('?', 1)[0].rstrip('/') or '/'
+    snapshot, bodies = self.store.current()
+
+    if path == '/':
+      index = {'endpoints': sorted(bodies), 'snapshot': snapshot, 'computations': self.store.computations,
+               'last_error': self.store.last_error}
+      self._send(HTTPStatus.OK, json.dumps(index).encode('utf-8'), head_only=head_only)
+      return
+
+    if snapshot is None:
+      # 아직 한 번도 계산에 성공하지 못함 (다음 확인 주기에 다시 시도)
+      self._send(HTTPStatus.SERVICE_UNAVAILABLE, json.dumps({'error': self.store.last_error}).encode('utf-8'),
+                 {'Retry-After': str(max(1, math.ceil(self.store.check_interval)))}, head_only=head_only)
+      return
+
+    if path not in bodies:
+      self._send(HTTPStatus.NOT_FOUND, json.dumps({'error': f'unknown endpoint: {path}'}).encode('utf-8'),
+                 head_only=head_only)
+      return
+
+    body, etag, last_modified = bodies[path]
+    headers = {
+        'ETag': etag,
+        'Last-Modified': formatdate(last_modified, usegmt=True),
+        'Cache-Control': 'no-cache'
+    }
+
+    if self._not_modified(etag, last_modified):
+      self._send(HTTPStatus.NOT_MODIFIED, b'', headers, head_only=head_only)
+    else:
+      self._send(HTTPStatus.OK, body, headers, head_only=head_only)
+
+  def _not_modified(self, etag, last_modified):
+    """If-None-Match 우선, 없으면 If-Modified-Since로 판단"""
+    if_none_match = self.headers.get('If-None-Match')
+    if if_none_match is not None:
+      tags = [tag.strip() for tag in if_none_match.split(',')]
+      return '*' in tags or etag in tags or f'W/{etag}' in tags
+
+    if_modified_since = self.headers.get('If-Modified-Since')
+    if if_modified_since is not None:
+      try:
+        return last_modified <= parsedate_to_datetime(if_modified_since).timestamp()
+      except (TypeError, ValueError):
+        return False
+
+    return False
+
+  def _send(self, status, body, headers=None, head_only=False):
+    self.send_response(status)
+    if status != HTTPStatus.NOT_MODIFIED:
+      self.send_header('Content-Type', 'application/json; charset=utf-8')
+      self.send_header('Content-Length', str(len(body)))
+    for name, value in (headers or {}).items():
+      self.send_header(name, value)
+    self.end_headers()
+    if body and not head_only:
+      self.wfile.write(body)
+
+  def log_message(self, format, *args):
+    # 부하 테스트 시 요청마다 stderr 로그가 병목이 되지 않도록 끈다
+    pass
+
+
+def make_server(host, port, store):
+  """MetricsStore를 사용하는 HTTP 서버 생성"""
+  handler = type('BoundMetricsHandler', (MetricsHandler,), {'store': store})
+  return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument('--host', default='127.0.0.1')
+  parser.add_argument('--port', type=int, default=8502)
+  parser.add_argument('--check-interval', type=float, default=DEFAULT_CHECK_INTERVAL)
+  args = parser.parse_args()
+
+  store = MetricsStore(check_interval=args.check_interval)
+  store.current()
+  if store.last_error is not None:
+    print(f"initial load failed, serving 503 until it succeeds: {store.last_error}", flush=True)
+
+  server = make_server(args.host, args.port, store)
+  print(f"serving metrics on http://{args.host}:{server.server_address[1]} (snapshot {store.current()[0]})",
+        flush=True)
+  try:
+    server.serve_forever()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    server.server_close()
+
+
+if __name__ == '__main__':
+  main()
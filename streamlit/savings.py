@@ -0,0 +1,225 @@
+import numpy as np
+import pandas as pd
+
+# 연결된 행이 없을 때의 위치값
+NO_MATCH = -1
+
+# id 범위가 행 수의 이 배수보다 작으면 직접 조회 테이블로 연결
+DENSE_ID_FACTOR = 4
+
+
+def _id_array(df, column):
+  """ID 컬럼을 int64 배열로 변환 (결측은 NO_MATCH)"""
+  if column not in df.columns:
+    return np.full(len(df), NO_MATCH, dtype=np.int64)
+  return pd.to_numeric(df[column], errors='coerce').fillna(NO_MATCH).to_numpy(np.int64)
+
+
+def _float_array(df, column):
+  """숫자 컬럼을 float 배열로 변환 (결측은 NaN)"""
+  if column not in df.columns:
+    return np.full(len(df), np.nan)
+  return pd.to_numeric(df[column], errors='coerce').to_numpy(float)
+
+
+def _align(sorted_ids, keys):
+  """keys가 가리키는 행의 위치 (sorted_ids에 없으면 NO_MATCH)
+
+  id가 조밀하면(범위가 행 수의 DENSE_ID_FACTOR배 이하) 이진 탐색 대신 직접 조회 테이블을 쓴다.
+  """
+  if len(sorted_ids) == 0:
+    return np.full(len(keys), NO_MATCH, dtype=np.int64)
+
+  low, high = int(sorted_ids[0]), int(sorted_ids[-1])
+  if high - low < DENSE_ID_FACTOR * len(sorted_ids):
+    lookup = np.full(high - low + 1, NO_MATCH, dtype=np.int64)
+    # id가 중복되면 searchsorted처럼 첫 번째 위치가 남도록 역순으로 채운다
+    lookup[sorted_ids[::-1] - low] = np.arange(len(sorted_ids) - 1, -1, -1)
+    in_range = (keys >= low) & (keys <= high)
+    return np.where(in_range, lookup[np.where(in_range, keys - low, 0)], NO_MATCH)
+
+  pos = np.minimum(np.searchsorted(sorted_ids, keys), len(sorted_ids) - 1)
+  return np.where(sorted_ids[pos] == keys, pos, NO_MATCH)
+
+
+def _take(values, pos, fill=np.nan):
+  """위치 배열로 값 가져오기 (NO_MATCH는 fill)"""
+  if len(values) == 0:
+    return np.full(len(pos), fill)
+  return np.where(pos != NO_MATCH, values[np.maximum(pos, 0)], fill)
+
+
+def _sort_by_id(df):
+  """id 기준 정렬 순서와 정렬된 id 배열 (id가 없는 행은 제외)"""
+  ids = _id_array(df, 'id')
+  rows = np.flatnonzero(ids != NO_MATCH)
+  rows = rows[np.argsort(ids[rows], kind='stable')]
+  return rows, ids[rows]
+
+
+class SavingsChain:
+  """공구방 -> 공구 상품 -> 상품 체인을 id 정렬 배열로 연결한 구조
+
+  테이블마다 id를 한 번 정렬해 두고 외래 키를 searchsorted로 위치 배열로 바꾼다.
+  공구방 i의 공구 상품은 board_gp_pos[i], 그 공구 상품의 단품은 gp_product_pos[j]이며
+  절약액 계산은 이 위치 배열에 대한 인덱싱만으로 처리한다 (category_id 조인처럼 행이 불어나지 않는다).
+
+  products.price는 상품 페이지의 판매 단위(예: "25과", "100장") 가격이고, 연결된 공구 상품의
+  group_products.price도 같은 판매 단위의 가격이다 (샘플 데이터 266건 모두 두 값이 같다).
+  판매 단위의 낱개 수를 알 수 없으므로 공구 가격만 quantity로 나눠 비교하면 할인이 quantity에서만
+  생긴다. 그래서 할인은 판매 단위끼리 비교하고, quantity는 참여자가 나눠 받는 수량으로만 쓴다.
+
+  - 할인액 = products.price - group_products.price (같은 판매 단위 기준)
+  - 참여자 1인당 분담액 = group_products.price / 정원(total_users)
+  - 참여자 1인당 절약액 = 할인액 / 정원
+  """
+
+  def __init__(self, boards, group_products, products, participants=None):
+    # 상품: 판매 단위 가격
+    product_rows, self.product_ids = _sort_by_id(products)
+    product_price = _float_array(products, 'price')[product_rows]
+
+    # 공구 상품: 판매 단위 가격/나눠 받는 수량과 단품 위치
+    gp_rows, self.gp_ids = _sort_by_id(group_products)
+    self.gp_price = _float_array(group_products, 'price')[gp_rows]
+    self.gp_quantity = _float_array(group_products, 'quantity')[gp_rows]
+    self.gp_category_ids = _id_array(group_products, 'category_id')[gp_rows]
+    self.gp_product_pos = _align(self.product_ids, _id_array(group_products, 'product_id')[gp_rows])
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+      self.unit_price = np.where(self.gp_quantity > 0, self.gp_price / self.gp_quantity, np.nan)
+      self.individual_price = _take(product_price, self.gp_product_pos)
+      self.discount = self.individual_price - self.gp_price
+      self.discount_rate = np.where(self.individual_price > 0, self.discount / self.individual_price, np.nan)
+
+    # 공구방: 정원과 공구 상품 위치 (원본 행 순서는 board_rows로 보관)
+    self.board_rows, self.board_ids = _sort_by_id(boards)
+    self.capacity = _float_array(boards, 'total_users')[self.board_rows]
+    self.board_gp_pos = _align(self.gp_ids, _id_array(boards, 'group_product_id')[self.board_rows])
+
+    # 공구방별 실제 참여 인원
+    if participants is not None and len(participants) > 0:
+      join_pos = _align(self.board_ids, _id_array(participants, 'group_board_id'))
+      self.participants = np.bincount(join_pos[join_pos != NO_MATCH], minlength=len(self.board_ids))
+    else:
+      self.participants = np.zeros(len(self.board_ids), dtype=np.int64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+      share = np.where(self.capacity > 0, 1 / self.capacity, np.nan)
+    self.units_per_participant = _take(self.gp_quantity, self.board_gp_pos) * share
+    self.cost_per_participant = _take(self.gp_price, self.board_gp_pos) * share
+    self.savings_per_participant = _take(self.discount, self.board_gp_pos) * share
+
+  def __len__(self):
+    return len(self.board_ids)
+
+  def product_table(self):
+    """공구 상품별 판매 단위 가격 비교 (단품이 연결되지 않은 상품은 NaN)"""
+    return pd.DataFrame({
+        'group_product_id': self.gp_ids,
+        'group_price': self.gp_price,
+        'quantity': self.gp_quantity,
+        'unit_price': self.unit_price,
+        'individual_price': self.individual_price,
+        'discount': self.discount,
+        'discount_rate': self.discount_rate
+    })
+
+  def board_table(self):
+    """공구방별 절약 효과 (실현 절약액 = 1인당 절약액 * 실제 참여 인원)"""
+    return pd.DataFrame({
+        'board_id': self.board_ids,
+        'group_product_id': _take(self.gp_ids, self.board_gp_pos, NO_MATCH),
+        'discount': _take(self.discount, self.board_gp_pos),
+        'discount_rate': _take(self.discount_rate, self.board_gp_pos),
+        'units_per_participant': self.units_per_participant,
+        'cost_per_participant': self.cost_per_participant,
+        'savings_per_participant': self.savings_per_participant,
+        'participants': self.participants,
+        'realized_savings': self.savings_per_participant * self.participants
+    })
+
+  def board_labels(self, labels):
+    """원본 공구방 행 순서의 라벨(예: 구 이름)을 공구방 id 순서로 재배열 (Categorical)"""
+    codes, names = pd.factorize(pd.Series(labels))
+    return pd.Categorical.from_codes(codes[self.board_rows], names)
+
+  def board_categories(self, categories, level='large_category', missing="기타"):
+    """공구방별 카테고리 이름 (공구 상품 category_id -> categories[level], Categorical)"""
+    category_rows, category_ids = _sort_by_id(categories)
+    if level in categories.columns:
+      names = categories[level].iloc[category_rows].fillna(missing).astype(str)
+    else:
+      names = pd.Series(missing, index=range(len(category_rows)))
+    codes, levels = pd.factorize(pd.concat([names, pd.Series([missing])], ignore_index=True))
+
+    # 공구 상품별 카테고리 코드를 먼저 만들고 공구방 위치로 가져온다
+    gp_codes = _take(codes, _align(category_ids, self.gp_category_ids), codes[-1])
+    board_codes = _take(gp_codes, self.board_gp_pos, codes[-1])
+    return pd.Categorical.from_codes(board_codes, levels)
+
+
+def savings_distribution(labels, values, weights=None):
+  """라벨별 values 분포 (공구방 수, 평균, 사분위수, weights 가중 합계)
+
+  값으로 정렬한 뒤 라벨 코드로 stable 정렬해 (라벨, 값) 순서를 만들고,
+  라벨 구간의 시작 위치에서 분위수를 바로 읽는다.
+  labels는 Categorical(board_labels/board_categories 결과)이면 코드를 그대로 쓴다.
+  values가 NaN인 행은 제외하고, 공구방 수가 많은 라벨부터 반환한다.
+  """
+  values = np.asarray(values, dtype=float)
+  codes, names = pd.factorize(labels)
+  keep = ~np.isnan(values) & (codes >= 0)
+  codes = codes[keep]
+  values = values[keep]
+
+  order = np.argsort(values)
+  # 라벨 수가 적으면 stable 정렬이 기수 정렬로 처리된다
+  small_codes = codes[order].astype(np.uint16) if len(names) <= np.iinfo(np.uint16).max else codes[order]
+  order = order[np.argsort(small_codes, kind='stable')]
+  sorted_values = values[order]
+
+  # 값이 하나도 없는 라벨(예: 단품이 연결되지 않은 공구방만 있는 카테고리)은 제외
+  counts = np.bincount(codes, minlength=len(names))
+  present = np.flatnonzero(counts)
+  counts = counts[present]
+  starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+  last = starts + counts - 1
+
+  def quantile(q):
+    # numpy 기본(linear) 보간과 같은 방식
+    pos = starts + q * (counts - 1)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, last)
+    return sorted_values[lo] + (pos - lo) * (sorted_values[hi] - sorted_values[lo])
+
+  table = pd.DataFrame({
+      'boards': counts,
+      'mean': np.bincount(codes, weights=values, minlength=len(names))[present] / counts,
+      'p25': quantile(0.25),
+      'median': quantile(0.5),
+      'p75': quantile(0.75)
+  }, index=pd.Index(np.asarray(names)[present], name='label'))
+
+  if weights is not None:
+    weights = np.asarray(weights, dtype=float)[keep]
+    table['total'] = np.bincount(codes, weights=values * weights, minlength=len(names))[present]
+
+  return table.sort_values('boards', ascending=False, kind='stable')
+
+
+def savings_summary(chain):
+  """전체 절약 효과 요약 (단품이 연결된 공구방 기준)"""
+  savings = chain.savings_per_participant
+  matched = ~np.isnan(savings)
+  discount_rate = _take(chain.discount_rate, chain.board_gp_pos)[matched]
+
+  return {
+      'boards': len(chain),
+      'matched_boards': int(matched.sum()),
+      'discounted_boards': int((discount_rate > 0).sum()),
+      'median_discount_rate': float(np.median(discount_rate)) if matched.any() else None,
+      'median_cost_per_participant': float(np.median(chain.cost_per_participant[matched])) if matched.any() else None,
+      'median_savings_per_participant': float(np.median(savings[matched])) if matched.any() else None,
+      'realized_savings': float(np.nansum(savings * chain.participants))
+  }
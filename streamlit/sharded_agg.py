@@ -0,0 +1,372 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# 상품 ID가 없는 찜(공구방 찜 등) 표시값
+MISSING_ID = -1
+
+# 64비트 곱셈 해시 상수 (user_id가 연속이어도 샤드에 고르게 분산)
+_HASH_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+# 워커 프로세스 시작 방식 (Streamlit 서버처럼 스레드가 도는 프로세스에서 fork는 안전하지 않다)
+# 앱과 벤치마크가 같은 값을 써야 측정한 손익분기점이 앱에도 들어맞는다
+DEFAULT_START_METHOD = 'spawn'
+
+# 테이블별로 워커에 넘기는 컬럼 (변환 후 모두 int64)
+PARTICIPANT_COLUMNS = ['user_id', 'group_board_id', 'trade_completed']
+FAVORITE_COLUMNS = ['user_id', 'product_id']
+
+
+def user_shard(user_ids, n_shards):
+  """user_id 해시 파티션 번호"""
+  hashed = user_ids.astype(np.uint64) * _HASH_MULTIPLIER
+  return ((hashed >> np.uint64(32)) % np.uint64(n_shards)).astype(np.int64)
+
+
+def _raw_column(df, column):
+  """컬럼을 숫자 numpy 배열로 꺼낸다 (int64 변환은 워커에서, 컬럼이 없으면 None)
+
+  숫자 dtype이면 복사 없이 그대로 넘기고, 문자열/nullable 정수처럼 숫자가 아닌 컬럼만 여기서 변환한다.
+  """
+  if column not in df.columns:
+    return None
+  values = df[column].to_numpy()
+  if values.dtype.kind in 'biuf':
+    return values
+
+  import pandas as pd
+  return pd.to_numeric(df[column], errors='coerce').to_numpy(float)
+
+
+def _to_int64(values, length):
+  """숫자 배열을 int64로 변환 (결측/없는 컬럼은 MISSING_ID)"""
+  if values is None:
+    return np.full(length, MISSING_ID, dtype=np.int64)
+  if values.dtype.kind == 'f':
+    return np.where(np.isnan(values), MISSING_ID, values).astype(np.int64)
+  return values.astype(np.int64, copy=False)
+
+
+def _change_mask(sorted_keys):
+  """정렬된 배열에서 각 구간의 첫 행 표시"""
+  mask = np.empty(len(sorted_keys), dtype=bool)
+  if len(sorted_keys) > 0:
+    mask[0] = True
+    np.not_equal(sorted_keys[1:], sorted_keys[:-1], out=mask[1:])
+  return mask
+
+
+def _grouped_stats(groups, values, value_span, flags=None, skip_value=None):
+  """groups별 행 수, 서로 다른 values 수, flags 합계
+
+  (group, value[, flag])를 int64 키 하나로 묶어 한 번만 정렬하므로 groupby/nunique보다 가볍다.
+  values는 0 이상 value_span 미만, flags는 0/1이어야 한다.
+  skip_value와 같은 value는 행 수에는 포함하고 서로 다른 values 수에서는 뺀다.
+  반환: (group 값, 행 수, 서로 다른 value 수, flag 합계 또는 None)
+  """
+  keys = groups * value_span + values
+  if flags is not None:
+    keys = keys * 2 + flags
+  keys = np.sort(keys)
+  pairs = keys >> 1 if flags is not None else keys
+  sorted_groups = pairs // value_span
+
+  if len(keys) == 0:
+    empty = np.empty(0, dtype=np.int64)
+    return empty, empty, empty, (empty if flags is not None else None)
+
+  group_starts = np.flatnonzero(_change_mask(sorted_groups))
+  counts = np.diff(np.append(group_starts, len(keys)))
+
+  first_of_pair = _change_mask(pairs)
+  if skip_value is not None:
+    first_of_pair &= (pairs - sorted_groups * value_span) != skip_value
+  distinct = np.add.reduceat(first_of_pair, group_starts, dtype=np.int64)
+
+  flag_sums = np.add.reduceat(keys & 1, group_starts, dtype=np.int64) if flags is not None else None
+  return sorted_groups[group_starts], counts, distinct, flag_sums
+
+
+class _SharedColumns:
+  """같은 길이의 숫자 컬럼들을 공유 메모리 블록 하나에 올려 워커와 공유
+
+  컬럼마다 dtype을 유지하며 8바이트 경계에 이어 붙인다.
+  """
+
+  def __init__(self, dtypes, length):
+    self.length = length
+    self.layout = []
+    offset = 0
+    for name, dtype in dtypes.items():
+      dtype = np.dtype(dtype)
+      self.layout.append((name, dtype.str, offset))
+      offset += -(-dtype.itemsize * length // 8) * 8
+    self.shm = shared_memory.SharedMemory(create=True, size=max(1, offset))
+
+  @classmethod
+  def from_columns(cls, columns, length):
+    """컬럼 값을 복사해 블록 생성 (값이 None인 컬럼은 올리지 않는다)"""
+    columns = {name: values for name, values in columns.items() if values is not None}
+    shared = cls({name: values.dtype for name, values in columns.items()}, length)
+    for name, dtype, offset in shared.layout:
+      np.ndarray(length, dtype=dtype, buffer=shared.shm.buf, offset=offset)[:] = columns[name]
+    return shared
+
+  @property
+  def spec(self):
+    return self.shm.name, self.layout, self.length
+
+  def release(self):
+    self.shm.close()
+    self.shm.unlink()
+
+
+class _LocalColumns:
+  """프로세스 풀 없이 실행할 때 쓰는 _SharedColumns 대용 (일반 numpy 배열, /dev/shm 사용 안 함)
+
+  spec은 컬럼 dict 자체이며, from_columns는 원본 배열을 복사하지 않는다.
+  """
+
+  def __init__(self, dtypes, length):
+    self.columns = {name: np.empty(length, dtype=dtype) for name, dtype in dtypes.items()}
+
+  @classmethod
+  def from_columns(cls, columns, length):
+    local = cls({}, length)
+    local.columns = {name: values for name, values in columns.items() if values is not None}
+    return local
+
+  @property
+  def spec(self):
+    return self.columns
+
+  def release(self):
+    self.columns = {}
+
+
+def _attach(spec):
+  """공유 메모리 블록에 연결해 (shm, 컬럼 dict) 반환 (_LocalColumns의 spec이면 shm은 None)"""
+  if isinstance(spec, dict):
+    return None, spec
+
+  name, layout, length = spec
+  shm = shared_memory.SharedMemory(name=name)
+  return shm, {column: np.ndarray(length, dtype=dtype, buffer=shm.buf, offset=offset)
+               for column, dtype, offset in layout}
+
+
+def _detach(*blocks):
+  """_attach로 연결한 공유 메모리 블록 닫기"""
+  for shm in blocks:
+    if shm is not None:
+      shm.close()
+
+
+def _partition_chunk(raw_spec, out_spec, start, stop, names, n_shards):
+  """연속 행 구간 하나를 int64로 변환하고 user_id 샤드 순서로 재배치 (워커 프로세스에서 실행)
+
+  user_id가 없는 행은 pandas groupby처럼 제외한다.
+  재배치한 행은 out의 [start, start + 남은 행 수) 구간에 샤드 순서로 기록한다.
+  반환: (샤드별 행 수, 컬럼별 최댓값)
+  """
+  raw_shm, raw = _attach(raw_spec)
+  out_shm, out = _attach(out_spec)
+
+  try:
+    length = stop - start
+    columns = {name: _to_int64(raw[name][start:stop] if name in raw else None, length) for name in names}
+    if 'trade_completed' in columns:
+      columns['trade_completed'] = (columns['trade_completed'] > 0).astype(np.int64)
+
+    has_user = columns['user_id'] != MISSING_ID
+    shard = user_shard(columns['user_id'][has_user], n_shards)
+    # 샤드 번호가 작은 정수라 stable 정렬이 기수 정렬로 처리된다
+    order = np.argsort(shard.astype(np.uint16), kind='stable')
+
+    rows = np.flatnonzero(has_user)[order]
+    kept = len(rows)
+    maxima = {}
+    for name, values in columns.items():
+      target = out[name][start:start + kept]
+      np.take(values, rows, out=target)
+      maxima[name] = int(target.max()) if kept > 0 else MISSING_ID
+
+    return np.bincount(shard, minlength=n_shards), maxima
+  finally:
+    _detach(raw_shm, out_shm)
+
+
+def _gather(columns, slices):
+  """샤드에 해당하는 청크별 구간을 이어 붙인다"""
+  return {name: np.concatenate([values[start:stop] for start, stop in slices]) if slices else
+          np.empty(0, dtype=np.int64) for name, values in columns.items()}
+
+
+def _aggregate_shard(participants_spec, participants_slices, favorites_spec, favorites_slices, spans):
+  """샤드 하나의 사용자/상품 부분 집계 (워커 프로세스에서 실행)"""
+  p_shm, p_cols = _attach(participants_spec)
+  f_shm, f_cols = _attach(favorites_spec)
+
+  try:
+    p_cols = _gather(p_cols, participants_slices)
+    f_cols = _gather(f_cols, favorites_slices)
+    p_user = p_cols['user_id']
+    p_board = p_cols['group_board_id']
+    p_completed = p_cols['trade_completed']
+    f_user = f_cols['user_id']
+    f_product = f_cols['product_id']
+    user_span, board_span, product_span = spans
+
+    # 사용자별 참여 횟수, 참여 공구방 수, 거래 완료 합계
+    participants = _grouped_stats(p_user, p_board + 1, board_span, flags=p_completed, skip_value=0)
+
+    # 사용자별 찜 수, 찜한 상품 수 (상품 ID가 없는 찜은 개수에만 포함)
+    favorites = _grouped_stats(f_user, f_product + 1, product_span, skip_value=0)
+
+    # 상품별 찜 수, 찜한 사용자 수 (사용자는 샤드 간 겹치지 않으므로 샤드 합 = 전체 nunique)
+    has_product = f_product != MISSING_ID
+    products = _grouped_stats(f_product[has_product], f_user[has_product], user_span)
+
+    return {
+        'participants': participants,
+        'favorites': favorites[:3],
+        'products': products[:3]
+    }
+  finally:
+    _detach(p_shm, f_shm)
+
+
+def _merge(partials):
+  """샤드별 부분 집계 병합"""
+  import pandas as pd
+
+  def concat(key, i):
+    return np.concatenate([part[key][i] for part in partials]) if partials else np.empty(0, dtype=np.int64)
+
+  # 사용자 집계: 샤드 간 사용자가 겹치지 않으므로 이어 붙이기만 하면 된다
+  participation = pd.DataFrame({
+      'participation_count': concat('participants', 1),
+      'boards_nunique': concat('participants', 2),
+      'completed_sum': concat('participants', 3)
+  }, index=pd.Index(concat('participants', 0), name='user_id'))
+  favorites = pd.DataFrame({
+      'favorite_count': concat('favorites', 1),
+      'favorite_products_nunique': concat('favorites', 2)
+  }, index=pd.Index(concat('favorites', 0), name='user_id'))
+
+  users = participation.join(favorites, how='outer')
+  users = users.fillna(0).astype(np.int64).sort_index()
+
+  # 상품 집계: 같은 상품이 여러 샤드에 나오므로 합산
+  product_ids, inverse = np.unique(concat('products', 0), return_inverse=True)
+  products = pd.DataFrame({
+      'favorite_count': np.bincount(inverse, weights=concat('products', 1), minlength=len(product_ids)),
+      'favorite_users_nunique': np.bincount(inverse, weights=concat('products', 2), minlength=len(product_ids))
+  }, index=pd.Index(product_ids, name='product_id')).astype(np.int64)
+
+  return {'users': users, 'products': products}
+
+
+def _chunk_bounds(length, n_chunks):
+  """[0, length)를 n_chunks개의 연속 구간으로 나눈 경계"""
+  return np.linspace(0, length, n_chunks + 1).astype(np.int64)
+
+
+def _shard_slices(bounds, shard_counts, n_shards):
+  """청크별 샤드 행 수로 샤드마다 (청크 구간) 목록 계산"""
+  slices = [[] for _ in range(n_shards)]
+  for chunk_start, counts in zip(bounds[:-1], shard_counts):
+    offsets = chunk_start + np.concatenate(([0], np.cumsum(counts)))
+    for shard in range(n_shards):
+      if offsets[shard + 1] > offsets[shard]:
+        slices[shard].append((int(offsets[shard]), int(offsets[shard + 1])))
+  return slices
+
+
+def aggregate_by_user(participants, favorites, n_workers=None, n_shards=None, start_method=None, timings=None):
+  """사용자/상품 단위 집계를 user_id 샤드별로 병렬 실행
+
+  부모 프로세스는 원본 숫자 컬럼을 공유 메모리에 복사만 하고, 나머지는 두 단계로 워커에서 실행한다.
+  1. 워커마다 연속 행 구간을 int64로 변환하고 user_id 해시 샤드 순서로 재배치
+  2. 샤드마다 참여 횟수, 거래 완료 합계, 참여 공구방 수, 찜 수, 찜한 상품 수,
+     상품별 찜 수/찜한 사용자 수를 계산
+  마지막으로 샤드별 결과를 병합한다.
+  n_workers=1이면 프로세스 풀과 공유 메모리 없이 현재 프로세스의 numpy 배열로 실행한다
+  (Docker 기본 64MB /dev/shm을 작은 데이터 경로에서 쓰지 않는다).
+  start_method가 없으면 DEFAULT_START_METHOD를 쓴다.
+  timings에 dict를 넘기면 단계별 소요 시간(copy, partition, aggregate, merge)을 기록한다.
+
+  반환: {'users': user_id 인덱스 DataFrame, 'products': product_id 인덱스 DataFrame}
+  """
+  n_workers = n_workers or os.cpu_count() or 1
+  n_shards = min(n_shards or n_workers, np.iinfo(np.uint16).max)
+  timings = {} if timings is None else timings
+  clock = time.perf_counter()
+
+  def lap(name):
+    nonlocal clock
+    now = time.perf_counter()
+    timings[name] = now - clock
+    clock = now
+
+  columns_type = _SharedColumns if n_workers > 1 else _LocalColumns
+  shared = []
+  try:
+    tables = []
+    for df, names in [(participants, PARTICIPANT_COLUMNS), (favorites, FAVORITE_COLUMNS)]:
+      raw = columns_type.from_columns({name: _raw_column(df, name) for name in names}, len(df))
+      shared.append(raw)
+      out = columns_type(dict.fromkeys(names, np.int64), len(df))
+      shared.append(out)
+      tables.append((raw.spec, out.spec, _chunk_bounds(len(df), n_workers), names))
+    lap('copy')
+
+    pool = None
+    if n_workers > 1:
+      mp_context = multiprocessing.get_context(start_method or DEFAULT_START_METHOD)
+      pool = ProcessPoolExecutor(max_workers=n_workers, mp_context=mp_context)
+
+    def run(func, *args):
+      return list(pool.map(func, *args) if pool is not None else map(func, *args))
+
+    try:
+      # 1단계: 두 테이블의 청크별 변환 + 샤드 재배치를 한 번에 분배
+      tasks = [(raw_spec, out_spec, start, stop, names, n_shards)
+               for raw_spec, out_spec, bounds, names in tables
+               for start, stop in zip(bounds[:-1], bounds[1:])]
+      results = run(_partition_chunk, *zip(*tasks))
+
+      partitioned = []
+      for table, (_, out_spec, bounds, names) in enumerate(tables):
+        chunk_results = results[table * n_workers:(table + 1) * n_workers]
+        slices = _shard_slices(bounds, [counts for counts, _ in chunk_results], n_shards)
+        maxima = {name: max(chunk_max[name] for _, chunk_max in chunk_results) for name in names}
+        partitioned.append((out_spec, slices, maxima))
+      lap('partition')
+
+      (p_spec, p_slices, p_max), (f_spec, f_slices, f_max) = partitioned
+
+      # (group, value) 키를 int64 하나로 묶기 위한 값 범위 (ID + 1, 결측 = 0)
+      spans = (max(f_max['user_id'], 0) + 2, max(p_max['group_board_id'], 0) + 2, max(f_max['product_id'], 0) + 2)
+      largest_group = max(p_max['user_id'], f_max['user_id'], f_max['product_id'], 0) + 2
+      if largest_group * max(spans) * 2 >= np.iinfo(np.int64).max:
+        raise ValueError("ID 범위가 너무 커서 int64 키로 묶을 수 없습니다")
+
+      # 2단계: 샤드별 집계
+      partials = run(_aggregate_shard, [p_spec] * n_shards, p_slices, [f_spec] * n_shards, f_slices,
+                     [spans] * n_shards)
+      lap('aggregate')
+    finally:
+      if pool is not None:
+        pool.shutdown()
+  finally:
+    for block in shared:
+      block.release()
+
+  merged = _merge(partials)
+  lap('merge')
+  return merged
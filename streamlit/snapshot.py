@@ -0,0 +1,21 @@
+import hashlib
+
+import pandas as pd
+
+
+def compute_snapshot_hash(data):
+  """데이터 스냅샷 해시 계산
+
+  테이블 이름, 컬럼, 행 내용을 모두 반영하므로 데이터가 바뀌면 해시도 바뀐다.
+  figure 캐시 등 스냅샷 단위 캐시의 키로 사용한다.
+  """
+  hasher = hashlib.sha1()
+
+  for key in sorted(data):
+    df = data[key]
+    hasher.update(key.encode('utf-8'))
+    hasher.update('\x1f'.join(map(str, df.columns)).encode('utf-8'))
+    if not df.empty:
+      hasher.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+
+  return hasher.hexdigest()[:16]
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+STREAMLIT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 테스트 모듈이 앱과 같은 방식으로 streamlit/ 아래 모듈을 바로 import 하도록 한다
+sys.path.insert(0, STREAMLIT_DIR)
+
+
+@pytest.fixture(scope='session')
+def repo_root():
+  """샘플 CSV(data/)를 찾을 수 있는 프로젝트 루트"""
+  return os.path.dirname(STREAMLIT_DIR)
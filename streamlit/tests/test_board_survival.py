@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from board_survival import NAT_NS, BoardJoins, fill_survival, observed_at
+
+
+def make_boards():
+  # 1: 마감 전 모집 완료, 2: 마감 지남 + 미모집, 3: 마감 전 + 미모집(진행 중)
+  boards = pd.DataFrame({
+      'id': [1, 2, 3],
+      'total_users': [2, 2, 2],
+      'created_at': ['2025-06-01 00:00', '2025-06-01 00:00', '2025-06-09 00:00'],
+      'deadline': ['2025-06-05 00:00', '2025-06-05 00:00', '2025-06-20 00:00']
+  })
+  participants = pd.DataFrame({
+      'group_board_id': [1, 1, 2, 3],
+      'joined_at': ['2025-06-01 01:00', '2025-06-02 00:00', '2025-06-01 02:00', '2025-06-10 00:00']
+  })
+  return boards, participants
+
+
+def test_observed_at_is_latest_snapshot_timestamp():
+  boards, participants = make_boards()
+  assert observed_at(boards, participants) == pd.Timestamp('2025-06-10 00:00')
+  assert observed_at(boards.head(0), participants.head(0)) is None
+
+
+def test_open_boards_are_censored_at_observation_time():
+  boards, participants = make_boards()
+  joins = BoardJoins(boards, participants)
+  as_of = observed_at(boards, participants)
+  table = joins.board_table(as_of=as_of).set_index('board_id')
+
+  assert table['filled_before_deadline'].tolist() == [True, False, False]
+  assert table['deadline_passed'].tolist() == [True, True, False]
+  # 진행 중 공구방은 마감(264시간)이 아니라 관측 시각(24시간)에서 절단
+  assert table.loc[3, 'duration_hours'] == 24
+  assert table.loc[2, 'duration_hours'] == 96
+
+  resolved = table['filled_before_deadline'] | table['deadline_passed']
+  assert table.loc[resolved, 'filled_before_deadline'].mean() == 0.5
+
+  survival = fill_survival(joins, scale='deadline', as_of=as_of)
+  censored_open = survival.loc[np.isclose(survival['time'], 24 / 264)]
+  assert censored_open['censored'].tolist() == [1]
+
+
+def test_without_as_of_boards_are_observed_to_deadline():
+  boards, participants = make_boards()
+  table = BoardJoins(boards, participants).board_table().set_index('board_id')
+  assert table['deadline_passed'].all()
+  assert table.loc[3, 'duration_hours'] == 264
+
+
+def test_join_before_created_counts_as_filled():
+  # 시계 오차로 참여 시각이 생성 시각보다 이른 공구방도 모집 완료로 본다
+  boards = pd.DataFrame({
+      'id': [1, 2],
+      'total_users': [1, 2],
+      'created_at': ['2025-06-01 12:00', '2025-06-01 12:00'],
+      'deadline': ['2025-06-05 00:00', '2025-06-05 00:00']
+  })
+  participants = pd.DataFrame({
+      'group_board_id': [1, 2],
+      'joined_at': ['2025-06-01 11:00', '2025-06-01 11:00']
+  })
+  joins = BoardJoins(boards, participants)
+
+  elapsed = joins.time_to_k(1)
+  assert elapsed.tolist() == [-3600 * 10**9, -3600 * 10**9]
+  assert joins.time_to_k(2)[1] == NAT_NS
+
+  table = joins.board_table().set_index('board_id')
+  assert table['filled_before_deadline'].tolist() == [True, False]
+  assert table['join_before_created'].tolist() == [True, False]
+  assert table.loc[1, 'fill_hours'] == 0
+  assert joins.fill_curve(fractions=(1.0,))['100%'].tolist()[0] == 0
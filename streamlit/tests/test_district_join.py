@@ -0,0 +1,69 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import pytest
+from shapely.geometry import box
+
+from district_join import DistrictIndex, assign_districts
+
+
+def make_index():
+  # A구 | B구가 경도 127에서 경계선을 공유하고, C구는 떨어져 있다
+  boundaries = gpd.GeoDataFrame(
+      {'name': ['A구', 'B구', 'C구']},
+      geometry=[box(126, 37, 127, 38), box(127, 37, 128, 38), box(129, 35, 130, 36)],
+      crs='EPSG:4326'
+  )
+  return DistrictIndex(boundaries)
+
+
+def test_assign_is_independent_of_batch_size():
+  index = make_index()
+  lat = np.array([37.5, 37.5, 35.5, 10.0, 37.2, 35.1, 37.9])
+  lon = np.array([126.5, 127.5, 129.5, 10.0, 127.9, 129.1, 126.1])
+  expected = ['A구', 'B구', 'C구', None, 'B구', 'C구', 'A구']
+
+  for batch_size in (1, 2, 3, len(lat), len(lat) + 5):
+    assert index.assign(lat, lon, batch_size=batch_size).tolist() == expected
+
+
+def test_missing_coordinates_are_none():
+  index = make_index()
+  lat = np.array([np.nan, 37.5, 37.5, np.nan])
+  lon = np.array([126.5, np.nan, 127.5, np.nan])
+  assert index.assign(lat, lon, batch_size=2).tolist() == [None, None, 'B구', None]
+  # 배치 전체가 좌표 없음이어도 다음 배치는 처리된다
+  assert index.assign(lat[[0, 3, 2]], lon[[0, 3, 2]], batch_size=2).tolist() == [None, None, 'B구']
+
+
+def test_point_on_shared_edge_gets_one_district():
+  index = make_index()
+  # 경계선 위의 점은 A구·B구 모두와 교차하지만 점마다 하나의 구만 할당되고, 뒤 점들의 위치가 밀리지 않는다
+  districts = index.assign([37.5, 37.5, 37.0, 37.5], [127.0, 126.5, 127.0, 127.5], batch_size=3)
+  assert districts[0] in ('A구', 'B구')
+  assert districts[2] in ('A구', 'B구')
+  assert districts[[1, 3]].tolist() == ['A구', 'B구']
+
+
+def test_points_outside_every_polygon_fall_back_to_address():
+  index = make_index()
+  df = pd.DataFrame({
+      'latitude': [37.5, 10.0, np.nan, 10.0],
+      'longitude': [126.5, 10.0, 127.5, 10.0],
+      'address': ['서울특별시 마포구 합정동', '서울특별시 강남구 역삼동', '경기도 성남시 분당', None]
+  })
+  assert assign_districts(df, 'address', index=index).tolist() == ['A구', '강남구', '성남시', '기타']
+
+
+def test_without_coordinates_or_index_everything_falls_back():
+  df = pd.DataFrame({'address': ['서울특별시 강남구 역삼동', '부산']})
+  assert assign_districts(df, 'address', index=make_index()).tolist() == ['강남구', '기타']
+  df['latitude'], df['longitude'] = 37.5, 126.5
+  assert assign_districts(df, 'address', index=None).tolist() == ['강남구', '기타']
+
+
+def test_missing_name_column_is_reported():
+  boundaries = gpd.GeoDataFrame({'SIG_KOR_NM': ['A구']}, geometry=[box(126, 37, 127, 38)], crs='EPSG:4326')
+  with pytest.raises(ValueError, match="'name'"):
+    DistrictIndex(boundaries)
+  assert DistrictIndex(boundaries, name_column='SIG_KOR_NM').assign([37.5], [126.5]).tolist() == ['A구']
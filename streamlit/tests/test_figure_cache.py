@@ -0,0 +1,77 @@
+from figure_cache import FigureCache
+
+
+class FakeFigure:
+  def __init__(self, payload):
+    self.payload = payload
+
+  def to_json(self):
+    return '{"data": [], "layout": {"title": {"text": "%s"}}}' % self.payload
+
+
+def test_key_params_split_cache_without_reaching_build():
+  cache = FigureCache()
+  calls = []
+
+  def build(height):
+    calls.append(height)
+    return FakeFigure(len(calls))
+
+  cache.get_or_build('snap', 'regional', build, key_params={'boundaries': 'a'}, height=400)
+  cache.get_or_build('snap', 'regional', build, key_params={'boundaries': 'a'}, height=400)
+  assert calls == [400]
+  assert cache.hits == 1
+
+  # 경계 파일 지문이 바뀌면 같은 스냅샷·뷰 파라미터라도 다시 그린다
+  cache.get_or_build('snap', 'regional', build, key_params={'boundaries': 'b'}, height=400)
+  assert calls == [400, 400]
+  assert len(cache) == 2
+
+
+def test_evicts_least_recently_used_over_byte_budget():
+  cache = FigureCache(max_bytes=30)
+  for name in ('a', 'b', 'c'):
+    cache.put(name, name * 10)
+  assert cache.current_bytes == 30
+
+  cache.put('d', 'd' * 10)
+  assert cache.get('a') is None
+  assert [cache.get(name) for name in ('b', 'c', 'd')] == ['b' * 10, 'c' * 10, 'd' * 10]
+  assert cache.current_bytes == 30
+
+  # 큰 항목 하나가 들어오면 오래된 항목부터 필요한 만큼 제거한다
+  cache.put('e', 'e' * 20)
+  assert len(cache) == 2
+  assert cache.get('d') == 'd' * 10
+  assert cache.current_bytes == 30
+
+
+def test_get_refreshes_recency():
+  cache = FigureCache(max_bytes=30)
+  for name in ('a', 'b', 'c'):
+    cache.put(name, name * 10)
+
+  assert cache.get('a') == 'a' * 10
+  cache.put('d', 'd' * 10)
+  assert cache.get('b') is None
+  assert cache.get('a') == 'a' * 10
+
+
+def test_oversized_figure_is_not_cached():
+  cache = FigureCache(max_bytes=30)
+  cache.put('a', 'a' * 10)
+  cache.put('big', 'x' * 31)
+  assert cache.get('big') is None
+  assert cache.get('a') == 'a' * 10
+  assert cache.current_bytes == 10
+
+  calls = []
+
+  def build():
+    calls.append(1)
+    return FakeFigure('x' * 40)
+
+  cache.get_or_build('snap', 'huge', build)
+  cache.get_or_build('snap', 'huge', build)
+  assert len(calls) == 2
+  assert len(cache) == 1
@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+
+import landing_kpis
+from data_files import files_fingerprint, resolve_csv_paths
+from landing_kpis import read_landing_kpis
+
+
+def write_csv(path, text):
+  with open(path, 'w', encoding='utf-8') as f:
+    f.write(text)
+
+
+def test_fingerprint_ignores_mtime_and_path(tmp_path):
+  first = tmp_path / 'a' / 'users.csv'
+  second = tmp_path / 'b' / 'users.csv'
+  for path in (first, second):
+    path.parent.mkdir()
+    write_csv(path, 'id\n1\n2\n')
+  os.utime(second, ns=(0, 0))
+
+  assert files_fingerprint({'users': str(first)}) == files_fingerprint({'users': str(second)})
+
+
+def test_fingerprint_tracks_content(tmp_path):
+  path = tmp_path / 'users.csv'
+  write_csv(path, 'id\n1\n2\n')
+  stat = os.stat(path)
+  before = files_fingerprint({'users': str(path)})
+
+  # 크기가 같아도 내용이 바뀌면 지문이 바뀐다 (수정 시각은 프로세스 내 해시 재사용 판단에만 쓰인다)
+  write_csv(path, 'id\n1\n3\n')
+  os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+  assert files_fingerprint({'users': str(path)}) != before
+
+
+def test_precompute_entry_point(tmp_path, monkeypatch, repo_root):
+  output = tmp_path / 'sidecar.json'
+  subprocess.run([sys.executable, landing_kpis.__file__, '--output', str(output)], cwd=repo_root, check=True)
+
+  monkeypatch.chdir(repo_root)
+  kpis = read_landing_kpis(str(output), files_fingerprint(resolve_csv_paths()))
+
+  assert kpis is not None
+  assert kpis['total_products'] == 860
+  assert kpis['total_users'] == 200
@@ -0,0 +1,180 @@
+import http.client
+import os
+import shutil
+import threading
+
+import geopandas as gpd
+import pytest
+from shapely.geometry import box
+
+import metrics_api
+from metrics_api import MetricsStore, make_server
+
+
+@pytest.fixture(scope='module')
+def server(repo_root):
+  cwd = os.getcwd()
+  os.chdir(repo_root)
+  try:
+    store = MetricsStore(check_interval=60, boundary_path=None)
+    store.current()
+  finally:
+    os.chdir(cwd)
+
+  server = make_server('127.0.0.1', 0, store)
+  thread = threading.Thread(target=server.serve_forever, daemon=True)
+  thread.start()
+  yield server
+  server.shutdown()
+  server.server_close()
+
+
+@pytest.fixture
+def conn(server):
+  conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+  yield conn
+  conn.close()
+
+
+def test_head_then_get_on_same_connection(conn):
+  conn.request('HEAD', '/metrics')
+  head = conn.getresponse()
+  assert head.status == 200
+  assert head.read() == b''
+  length = int(head.getheader('Content-Length'))
+
+  # 같은 keep-alive 연결의 다음 GET은 본문을 받아야 한다
+  conn.request('GET', '/metrics')
+  get = conn.getresponse()
+  assert get.status == 200
+  assert len(get.read()) == length
+
+
+def test_if_none_match_returns_304(conn):
+  conn.request('GET', '/metrics')
+  first = conn.getresponse()
+  first.read()
+  etag = first.getheader('ETag')
+
+  conn.request('GET', '/metrics', headers={'If-None-Match': etag})
+  second = conn.getresponse()
+  assert second.status == 304
+  assert second.read() == b''
+  assert second.getheader('ETag') == etag
+
+  conn.request('GET', '/metrics', headers={'If-None-Match': '"stale"'})
+  third = conn.getresponse()
+  assert third.status == 200
+  assert third.read()
+
+
+def test_if_modified_since_returns_304(conn):
+  conn.request('GET', '/distributions')
+  first = conn.getresponse()
+  first.read()
+  last_modified = first.getheader('Last-Modified')
+
+  conn.request('GET', '/distributions', headers={'If-Modified-Since': last_modified})
+  second = conn.getresponse()
+  assert second.status == 304
+  assert second.read() == b''
+
+  conn.request('GET', '/distributions', headers={'If-Modified-Since': 'Thu, 01 Jan 1970 00:00:00 GMT'})
+  third = conn.getresponse()
+  assert third.status == 200
+  assert third.read()
+
+
+def test_unknown_endpoint(conn):
+  conn.request('GET', '/nope')
+  response = conn.getresponse()
+  assert response.status == 404
+  assert b'unknown endpoint' in response.read()
+
+
+def test_boundary_file_changes_district_etags(tmp_path, monkeypatch, repo_root):
+  monkeypatch.chdir(repo_root)
+  boundary_path = tmp_path / 'districts.geojson'
+  store = MetricsStore(check_interval=0, boundary_path=str(boundary_path))
+
+  _, before = store.current()
+  assert store.district_index is None
+
+  # 샘플 좌표를 모두 덮는 구 하나
+  gpd.GeoDataFrame({'name': ['테스트구']}, geometry=[box(124, 33, 132, 39)], crs='EPSG:4326') \
+      .to_file(boundary_path, driver='GeoJSON')
+  _, after = store.current()
+
+  assert store.district_index is not None
+  assert store.computations == 2
+  assert after['/districts'][1] != before['/districts'][1]
+  assert '테스트구'.encode('utf-8') in after['/districts'][0]
+  # 경계와 무관한 엔드포인트는 ETag·Last-Modified 유지
+  assert after['/metrics'][1:] == before['/metrics'][1:]
+
+
+@pytest.fixture
+def data_copy(tmp_path, monkeypatch, repo_root):
+  """샘플 CSV를 복사한 작업 디렉터리"""
+  shutil.copytree(os.path.join(repo_root, 'data'), tmp_path / 'data')
+  monkeypatch.chdir(tmp_path)
+  return tmp_path / 'data'
+
+
+def test_empty_csv_is_an_empty_table(data_copy):
+  (data_copy / 'categories_dummy_211.csv').write_text('')
+  store = MetricsStore(check_interval=0, boundary_path=None)
+
+  snapshot, bodies = store.current()
+  assert store.last_error is None
+  assert snapshot is not None
+  assert b'"categories"' not in bodies['/distributions'][0]
+
+
+def test_failed_refresh_keeps_last_snapshot_and_retries(data_copy, monkeypatch):
+  store = MetricsStore(check_interval=0, boundary_path=None)
+  snapshot, bodies = store.current()
+
+  compute_metrics = metrics_api.compute_metrics
+  monkeypatch.setattr(metrics_api, 'compute_metrics', lambda *args: 1 / 0)
+  with open(data_copy / 'users_dummy_200.csv', 'a', encoding='utf-8') as f:
+    f.write('\n')
+
+  assert store.current() == (snapshot, bodies)
+  assert store.last_error.startswith('ZeroDivisionError')
+
+  monkeypatch.setattr(metrics_api, 'compute_metrics', compute_metrics)
+  store.current()
+  assert store.last_error is None
+  assert store.computations == 2
+
+
+def test_unavailable_until_first_success(data_copy, monkeypatch):
+  monkeypatch.setattr(metrics_api, 'compute_metrics', lambda *args: 1 / 0)
+  store = MetricsStore(check_interval=60, boundary_path=None)
+  server = make_server('127.0.0.1', 0, store)
+  thread = threading.Thread(target=server.serve_forever, daemon=True)
+  thread.start()
+  try:
+    conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=5)
+    conn.request('GET', '/metrics')
+    response = conn.getresponse()
+    assert response.status == 503
+    assert response.getheader('Retry-After') == '60'
+    assert b'ZeroDivisionError' in response.read()
+    conn.close()
+  finally:
+    server.shutdown()
+    server.server_close()
+
+
+def test_published_bodies_are_consistent_and_read_only(data_copy):
+  store = MetricsStore(check_interval=0, boundary_path=None)
+  published = store.current()
+
+  # 스냅샷·본문·ETag는 한 튜플로 함께 교체된다
+  assert store.current() is published
+  for body, etag, _ in published[1].values():
+    assert etag == metrics_api._etag(body)
+  with pytest.raises(TypeError):
+    published[1]['/metrics'] = (b'{}', '"x"', 0)
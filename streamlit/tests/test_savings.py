@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from savings import SavingsChain, savings_summary
+
+
+def make_chain():
+  # 공구 상품 1: 단품과 같은 가격, 2: 단품보다 3,000원 싸다, 3: 단품 없음
+  products = pd.DataFrame({'id': [10, 20], 'price': [12_000, 30_000]})
+  group_products = pd.DataFrame({
+      'id': [1, 2, 3],
+      'price': [12_000, 27_000, 5_000],
+      'quantity': [12, 5, 2],
+      'product_id': [10, 20, np.nan],
+      'category_id': [1, 1, 1]
+  })
+  boards = pd.DataFrame({'id': [100, 200, 300], 'total_users': [4, 3, 2], 'group_product_id': [1, 2, 3]})
+  participants = pd.DataFrame({'group_board_id': [100, 100, 200, 200, 200]})
+  return SavingsChain(boards, group_products, products, participants)
+
+
+def test_discount_does_not_come_from_quantity():
+  table = make_chain().board_table().set_index('board_id')
+
+  # 같은 판매 단위 가격이면 quantity와 무관하게 할인 없음
+  assert table.loc[100, 'discount_rate'] == 0
+  assert table.loc[100, 'savings_per_participant'] == 0
+  assert table.loc[100, 'cost_per_participant'] == 3_000
+  assert table.loc[100, 'units_per_participant'] == 3
+
+  assert table.loc[200, 'discount_rate'] == 0.1
+  assert table.loc[200, 'savings_per_participant'] == 1_000
+  assert table.loc[200, 'realized_savings'] == 3_000
+  assert np.isnan(table.loc[300, 'savings_per_participant'])
+
+
+def test_summary_counts_discounted_boards():
+  summary = savings_summary(make_chain())
+  assert summary['matched_boards'] == 2
+  assert summary['discounted_boards'] == 1
+  assert summary['median_discount_rate'] == 0.05
+  assert summary['realized_savings'] == 3_000
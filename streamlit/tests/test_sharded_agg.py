@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import sharded_agg
+from sharded_agg import aggregate_by_user
+
+
+def make_data(n_rows=20_000, seed=0):
+  rng = np.random.default_rng(seed)
+  participants = pd.DataFrame({
+      'user_id': rng.integers(1, 2_000, n_rows).astype(float),
+      'group_board_id': rng.integers(1, 500, n_rows),
+      'trade_completed': rng.integers(0, 2, n_rows).astype(float)
+  })
+  favorites = pd.DataFrame({
+      'user_id': rng.integers(1, 2_000, n_rows),
+      'product_id': rng.integers(1, 300, n_rows).astype(float)
+  })
+  # 결측 user_id는 제외, 결측 product_id는 개수에만 포함, 결측 거래 완료는 미완료
+  participants.loc[::7, 'user_id'] = np.nan
+  participants.loc[::13, 'trade_completed'] = np.nan
+  favorites.loc[::11, 'product_id'] = np.nan
+  return participants, favorites
+
+
+def expected(participants, favorites):
+  users = participants.groupby('user_id').agg(
+      participation_count=('group_board_id', 'size'),
+      boards_nunique=('group_board_id', 'nunique'),
+      completed_sum=('trade_completed', 'sum')
+  ).join(favorites.groupby('user_id').agg(
+      favorite_count=('product_id', 'size'),
+      favorite_products_nunique=('product_id', 'nunique')
+  ), how='outer').fillna(0).astype(np.int64)
+  users.index = users.index.astype(np.int64)
+
+  products = favorites.groupby('product_id').agg(
+      favorite_count=('user_id', 'size'),
+      favorite_users_nunique=('user_id', 'nunique')
+  )
+  products.index = products.index.astype(np.int64)
+  return users, products
+
+
+@pytest.mark.parametrize('n_workers, n_shards, start_method', [
+    (1, None, None),
+    (1, 5, None),
+    (2, 3, 'spawn')
+])
+def test_matches_pandas_groupby(n_workers, n_shards, start_method):
+  participants, favorites = make_data()
+  users, products = expected(participants, favorites)
+
+  result = aggregate_by_user(participants, favorites, n_workers=n_workers, n_shards=n_shards,
+                             start_method=start_method)
+  pd.testing.assert_frame_equal(result['users'][users.columns], users, check_names=False)
+  pd.testing.assert_frame_equal(result['products'][products.columns], products, check_names=False)
+
+
+def test_single_worker_does_not_use_shared_memory(monkeypatch):
+  def no_shared_memory(*args, **kwargs):
+    raise AssertionError("n_workers=1 must not allocate /dev/shm")
+
+  monkeypatch.setattr(sharded_agg.shared_memory, 'SharedMemory', no_shared_memory)
+  participants, favorites = make_data()
+  users, products = expected(participants, favorites)
+
+  result = aggregate_by_user(participants, favorites, n_workers=1, n_shards=3)
+  pd.testing.assert_frame_equal(result['users'][users.columns], users, check_names=False)
+  pd.testing.assert_frame_equal(result['products'][products.columns], products, check_names=False)
+
+
+def test_empty_tables():
+  result = aggregate_by_user(pd.DataFrame(), pd.DataFrame(), n_workers=2)
+  assert result['users'].empty
+  assert result['products'].empty